@@ -1,14 +1,25 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, request, jsonify, send_from_directory, render_template, g, has_request_context, stream_with_context
 from flask_cors import CORS
 import json
 import re
-from difflib import SequenceMatcher
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import random
-from typing import Optional
-import unicodedata
 import os
-import copy
+import hmac
+import time
+
+from text_utils import calculate_similarity, normalize_name, normalize_message
+from data_store import DataStore, load_data
+from course_catalog import CourseMatch
+from suggest_index import MAX_SUGGESTIONS
+from records import OfficeHours
+from availability import WEEKDAYS, to_minutes, format_minutes, format_interval, next_office_hours
+from session_store import create_session_store
+from intent_engine import parse_message
+from response_cache import ResponseCache
+from serialized_body import SerializedBody
+from metrics import REGISTRY
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
@@ -32,53 +43,76 @@ CORS(app, origins=[
 
 app.secret_key = 'htu_info_bot_secret_key_2024'
 
-def load_data():
-    """Loads data from JSON files with comprehensive error handling."""
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    subjects_path = os.path.join(project_root, 'full_subjects_study_plan.json')
-    office_hours_path = os.path.join(project_root, 'office_hours.json')
-    
-    try:
-        with open(subjects_path, 'r', encoding='utf-8') as f:
-            subjects_data = json.load(f)
-        print(f"✅ Successfully loaded subjects data from {subjects_path}")
-    except FileNotFoundError:
-        print(f"❌ Subjects file not found: {subjects_path}")
-        subjects_data = {}
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error in subjects file: {e}")
-        subjects_data = {}
-    except PermissionError as e:
-        print(f"❌ Permission error accessing subjects file: {e}")
-        subjects_data = {}
-    
-    try:
-        with open(office_hours_path, 'r', encoding='utf-8') as f:
-            office_hours_data = json.load(f)
-        print(f"✅ Successfully loaded office hours data from {office_hours_path}")
-    except FileNotFoundError:
-        print(f"❌ Office hours file not found: {office_hours_path}")
-        office_hours_data = []
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error in office hours file: {e}")
-        office_hours_data = []
-    except PermissionError as e:
-        print(f"❌ Permission error accessing office hours file: {e}")
-        office_hours_data = []
-    
-    return subjects_data, office_hours_data
-
-subjects_data, office_hours_data = load_data()
-
-class ConversationContext:
-    def __init__(self):
-        self.last_query_type: Optional[str] = None
-        self.last_subject: Optional[str] = None
-        self.last_professor: Optional[str] = None
-        self.query_count: int = 0
-        self.preferences: dict = {}
-
-context = ConversationContext()
+# DATA_SNAPSHOT_CACHE=0 turns off the pickled snapshot cache next to the data files
+data_store = DataStore(use_snapshot_cache=os.environ.get('DATA_SNAPSHOT_CACHE', '1') != '0')
+
+# Seconds between checks of the JSON files for changes (0 disables the watcher)
+DATA_RELOAD_INTERVAL = float(os.environ.get('DATA_RELOAD_INTERVAL', 30))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+# Most messages accepted by one /api/chat/batch request
+MAX_BATCH_SIZE = int(os.environ.get('CHAT_BATCH_MAX', 1000))
+
+# Office hours are in campus time; "now" is read in this zone
+OFFICE_HOURS_TZ = os.environ.get('OFFICE_HOURS_TZ', 'Asia/Amman')
+try:
+    LOCAL_TZ = ZoneInfo(OFFICE_HOURS_TZ)
+except ZoneInfoNotFoundError:
+    print(f"⚠️ Unknown time zone {OFFICE_HOURS_TZ}, using the server's local time")
+    LOCAL_TZ = None
+
+def get_snapshot():
+    """Returns the data snapshot for the current request.
+
+    The snapshot is pinned on first use, so a reload that lands mid-request
+    does not mix two versions of the data in one response.
+    """
+    if not has_request_context():
+        return data_store.snapshot
+    if 'snapshot' not in g:
+        g.snapshot = data_store.snapshot
+    return g.snapshot
+
+# Conversation context is kept per session id, not shared between users
+session_store = create_session_store(
+    redis_url=os.environ.get('SESSION_REDIS_URL'),
+    max_sessions=int(os.environ.get('SESSION_MAX', 10000)),
+    ttl=float(os.environ.get('SESSION_TTL', 1800))
+)
+
+# Answers to non-follow-up messages, keyed by (data version, normalized message)
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('RESPONSE_CACHE_SIZE', 2048)),
+    ttl=float(os.environ.get('RESPONSE_CACHE_TTL', 300))
+)
+
+# Hot-path instrumentation, exposed on /metrics
+STAGE_SECONDS = REGISTRY.histogram(
+    'htu_chat_stage_duration_seconds', 'Time spent in each stage of the chat pipeline.', ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'htu_chat_request_duration_seconds', 'End-to-end /api/chat latency by intent.', ['intent'])
+LOOKUP_MATCHES = REGISTRY.counter(
+    'htu_lookup_matches_total', 'Course and professor lookups by match type.', ['lookup', 'match_type'])
+ERRORS = REGISTRY.counter(
+    'htu_errors_total', 'Requests that failed with an exception.', ['endpoint'])
+REGISTRY.callback(
+    'htu_response_cache_lookups_total', 'Response cache lookups by result.',
+    lambda: [(('hit',), response_cache.hits), (('miss',), response_cache.misses)], ['result'], kind='counter')
+REGISTRY.callback(
+    'htu_response_cache_entries', 'Answers currently held in the response cache.', lambda: len(response_cache))
+REGISTRY.callback(
+    'htu_sessions', 'Conversation sessions held in this worker.', lambda: len(session_store) if hasattr(session_store, '__len__') else 0)
+REGISTRY.callback(
+    'htu_data_version', 'Version of the loaded data snapshot.', lambda: data_store.snapshot.version)
+REGISTRY.callback(
+    'htu_data_snapshot_age_seconds', 'Seconds since the loaded data snapshot was built.',
+    lambda: round(time.time() - data_store.snapshot.loaded_at, 3))
+
+def session_reply(session_id, context, payload):
+    """Saves the session context and returns the payload with its session id."""
+    context.query_count += 1
+    session_store.save(session_id, context)
+    payload['session_id'] = session_id
+    return payload
 
 def parse_office_hours(raw_text):
     """Parses the raw office hours string into a structured dictionary."""
@@ -136,114 +170,69 @@ def parse_office_hours(raw_text):
 
     return data
 
-def calculate_similarity(a, b):
-    """Calculates the similarity between two strings."""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
-
-def normalize_name(name):
-    """Normalizes names for consistent matching."""
-    if not isinstance(name, str):
-        return ''
-    # Lowercase, strip, replace all dashes with '-', collapse spaces, remove diacritics
-    name = name.lower().strip()
-    name = re.sub(r'[\u2010-\u2015\u2212\uFE58\uFE63\uFF0D\u2013\u2014\u2015]', '-', name)  # all dash-like chars
-    name = re.sub(r'\s+', ' ', name)
-    name = ''.join(c for c in unicodedata.normalize('NFKD', name) if not unicodedata.combining(c))
-    return name
-
 def find_subject_info_smart(subject_code):
-    """Finds subject information with fuzzy matching."""
-    if not subjects_data:
+    """Finds subject information with fuzzy matching.
+
+    Returns a CourseMatch referencing the catalog record, or None.
+    """
+    course_catalog = get_snapshot().course_catalog
+    if not course_catalog:
         return None
-        
-    for major, levels in subjects_data.items():
-        for level, subjects in levels.items():
-            if subject_code.upper() in subjects:
-                subject_info = subjects[subject_code.upper()]
-                return {
-                    'major': major,
-                    'level': level,
-                    'name': subject_info['name'],
-                    'description': subject_info['description'],
-                    'credits': subject_info['credits'],
-                    'match_type': 'exact'
-                }
-    
-    best_match = None
-    best_score = 0.6
-    
-    for major, levels in subjects_data.items():
-        for level, subjects in levels.items():
-            for code in subjects.keys():
-                similarity = calculate_similarity(subject_code, code)
-                if similarity > best_score:
-                    best_score = similarity
-                    subject_info = subjects[code]
-                    best_match = {
-                        'major': major,
-                        'level': level,
-                        'name': subject_info['name'],
-                        'description': subject_info['description'],
-                        'credits': subject_info['credits'],
-                        'match_type': 'fuzzy',
-                        'original_code': code,
-                        'similarity': similarity
-                    }
-    return best_match
+
+    course = course_catalog.get(subject_code)
+    if course:
+        return CourseMatch(course, 'exact', 1.0)
+
+    best = course_catalog.code_matcher.best(subject_code)
+    if best is None:
+        return None
+    course, similarity = best
+    return CourseMatch(course, 'fuzzy', similarity)
 
 def find_professor_office_hours_smart(professor_name):
-    """Finds professor information from the structured list."""
-    if not office_hours_data:
+    """Finds professor information from the structured list.
+
+    Returns ProfessorMatch objects that reference the loaded records; call
+    to_dict() on the ones that are actually sent to the client.
+    """
+    snapshot = get_snapshot()
+    if not snapshot.professors:
         return []
-        
-    clean_input = normalize_name(professor_name)
-    potential_matches = []
-    
-    for prof in office_hours_data:
-        prof_name_from_data = normalize_name(prof.get('name', ''))
-        if not prof_name_from_data:
-            continue
-        
-        # Create a deep copy to prevent any chance of data corruption
-        prof_copy = copy.deepcopy(prof)
-        
-        similarity = calculate_similarity(clean_input, prof_name_from_data)
-        
-        if clean_input == prof_name_from_data:
-            prof_copy['match_type'] = 'exact'
-            prof_copy['similarity'] = 1.0
-            return [prof_copy]
-
-        if clean_input in prof_name_from_data or similarity > 0.6:
-            prof_copy['match_type'] = 'contains' if clean_input in prof_name_from_data else 'fuzzy'
-            prof_copy['similarity'] = similarity
-            potential_matches.append(prof_copy)
-            
-    potential_matches.sort(key=lambda x: x.get('similarity', 0), reverse=True)
-    return potential_matches
+
+    # Set by /api/chat/batch, which scores all its messages against the directory at once
+    overlaps = g.get('professor_overlaps', {}).get(professor_name) if has_request_context() else None
+    return snapshot.professor_index.search(professor_name, MAX_PROFESSOR_CHOICES, overlaps)
+
+def needs_choice(matches):
+    """Returns whether the user should pick from professor matches rather than get the first.
+
+    That is when several names match, or the only one is a guess by how it sounds.
+    """
+    return (len(matches) > 1 and matches[0].match_type != 'exact') or matches[0].match_type == 'sound'
+
+# Stands in for the user's message in cached replies; filled in per request
+QUERY_SLOT = '\x00query\x00'
+
+def choice_prompt(matches, query):
+    if len(matches) > 1:
+        return f"🤔 I found a few people matching **{query}**. Who are you looking for?"
+    return f"🤔 I couldn't find **{query}**, but this name sounds similar. Is it who you are looking for?"
+
+def find_courses_by_topic(query, match_all=False):
+    """Finds courses whose name or description covers the query's topic, best first."""
+    return get_snapshot().course_search.search(query, MAX_TOPIC_RESULTS, match_all)
 
 def find_professors_in_department(department_name, exclude_professor_name):
     """Finds all professors in a given department, excluding one professor."""
-    if not department_name or not office_hours_data:
+    department = get_snapshot().department_index.get(department_name or '')
+    if department is None:
         return []
-    
-    colleagues = []
-    normalized_exclude_name = normalize_name(exclude_professor_name)
-    
-    for prof in office_hours_data:
-        prof_department = prof.get('department', '')
-        prof_name = prof.get('name', '')
-        
-        # Check for department match (case-insensitive) and ensure it's not the excluded professor
-        if (prof_department.lower() == department_name.lower() and 
-            normalize_name(prof_name) != normalized_exclude_name):
-            colleagues.append(prof_name)
-    
-    return colleagues
+    return [prof.name for prof in department.colleagues(exclude_professor_name)]
 
 def find_study_plan(major_query, level_query):
     """Finds study plan for a specific major and level."""
-    if not subjects_data:
+    course_catalog = get_snapshot().course_catalog
+    if not course_catalog.by_major:
         return None
         
     # Normalize the major query
@@ -267,14 +256,13 @@ def find_study_plan(major_query, level_query):
     target_level = level_mapping.get(level_query, level_query.title())
     
     # Find the major
-    for major, levels in subjects_data.items():
-        if major_query in major.lower():
-            if target_level in levels:
-                return {
-                    'major': major,
-                    'level': target_level,
-                    'plan': levels[target_level]
-                }
+    major, plan = course_catalog.find_plan(major_query, target_level)
+    if major:
+        return {
+            'major': major,
+            'level': target_level,
+            'plan': plan
+        }
     
     return None
 
@@ -297,18 +285,7 @@ def format_schedule(schedule_dict):
 
 def extract_intent(user_message):
     """Extracts user intent from the message."""
-    message_lower = user_message.lower()
-    
-    if any(word in message_lower for word in ['help', 'what can you do', 'assist']):
-        return 'help'
-    elif any(word in message_lower for word in ['course', 'subject', 'cs', 'it', 'se']):
-        return 'course_search'
-    elif any(word in message_lower for word in ['professor', 'teacher', 'instructor', 'dr', 'dr.']):
-        return 'professor_search'
-    elif any(word in message_lower for word in ['plan', 'curriculum', 'year']):
-        return 'study_plan'
-    else:
-        return 'unknown'
+    return parse_message(user_message).intent
 
 def generate_smart_response(intent, user_message, subject_result=None, professor_results=None):
     """Generates intelligent responses based on intent and results."""
@@ -322,6 +299,7 @@ I can help you with:
 
 📚 **Course Information:**
 • Search by subject code (e.g., CS201, CS101)
+• Search by topic (e.g., which course covers SQL?)
 • Get course details, credits, and descriptions
 • Find prerequisites and program information
 
@@ -344,47 +322,50 @@ Try asking me about any course or professor!
         }
     
     elif subject_result:
-        if subject_result['match_type'] == 'fuzzy':
-            response = f"🔍 I found a similar course: **{subject_result['original_code']}**\n\n"
-            response += f"📚 **{subject_result['original_code']} - {subject_result['name']}**\n\n"
+        course = subject_result.course
+        if subject_result.match_type == 'fuzzy':
+            response = f"🔍 I found a similar course: **{course.code}**\n\n"
         else:
-            response = f"📚 **{user_message.upper()} - {subject_result['name']}**\n\n"
+            response = ""
+        response += f"📚 **{course.code} - {course.name}**\n\n"
         
-        response += f"**Description:** {subject_result['description']}\n"
-        response += f"**Credits:** {subject_result['credits']}\n"
-        response += f"**Level:** {subject_result['level']}\n"
-        response += f"**Program:** {subject_result['major']}\n\n"
+        response += f"**Description:** {course.description}\n"
+        response += f"**Credits:** {course.credits}\n"
+        response += f"**Level:** {course.level}\n"
+        response += f"**Program:** {course.major}\n\n"
         
-        if subject_result['match_type'] == 'fuzzy':
-            response += f"💡 *Did you mean {subject_result['original_code']} instead of your search?*"
+        if subject_result.match_type == 'fuzzy':
+            response += f"💡 *Did you mean {course.code} instead of your search?*"
         
         response += "\n\n💡 **You can also ask:**\n• Which professors teach this course?\n• Are there prerequisites?"
         return {'text': response}
 
     elif professor_results:
-        # Handle multiple potential matches
-        if len(professor_results) > 1:
+        # Handle multiple potential matches, or a single guess
+        if needs_choice(professor_results):
+            # Cached under the normalized message, so the user's own text is filled in later
             response = {
-                'text': f"🤔 I found a few people matching **{user_message}**. Who are you looking for?",
-                'buttons': [prof.get('name', 'N/A') for prof in professor_results[:4]]
+                'text': choice_prompt(professor_results, QUERY_SLOT),
+                'buttons': [match.name or 'N/A' for match in professor_results[:MAX_PROFESSOR_CHOICES]]
             }
             return response
 
         # Handle a single match
-        details = professor_results[0]
-        prof_display_name = details.get('name', 'N/A')
+        match = professor_results[0]
+        details = match.record
+        prof_display_name = details.name or 'N/A'
 
-        if details.get('match_type') == 'fuzzy':
+        if match.match_type in ('fuzzy', 'phonetic'):
             response = f"🤖 I found someone with a similar name: **{prof_display_name}**.\n\n"
         else:
             response = f"👨‍🏫 Here is the information for **{prof_display_name}**:\n\n"
 
-        response += f"**School:** {details.get('school', 'N/A')}\n"
-        response += f"**Department:** {details.get('department', 'N/A')}\n"
-        response += f"**Email:** {details.get('email', 'N/A')}\n"
-        response += f"**Office:** {details.get('office', 'N/A')}\n\n"
+        response += f"**School:** {details.school or 'N/A'}\n"
+        response += f"**Department:** {details.department or 'N/A'}\n"
+        response += f"**Email:** {details.email or 'N/A'}\n"
+        response += f"**Office:** {details.office or 'N/A'}\n\n"
 
-        schedule = format_schedule(details.get('office_hours', {}))
+        schedule = format_schedule(details.office_hours)
         response += f"**Office Hours Schedule:**\n{schedule}"
         
         # Dynamic suggestions based on context
@@ -394,13 +375,244 @@ Try asking me about any course or professor!
 
         return {'text': response}
     
-    elif intent == 'unknown':
+    else:
+        # Unknown intent, or nothing found for the course/professor searched for
         response = {
             'text': "🤔 I'm not sure I understood. Here are some things you can ask me:",
             'buttons': ["Find a Course", "Find a Professor", "View a Study Plan", "Help"]
         }
         return response
 
+# Most professors offered as buttons when a name matches several
+MAX_PROFESSOR_CHOICES = 4
+# Longest lists of professors shown for "who is available" and "everyone in X" questions
+MAX_AVAILABILITY_LINES = 15
+MAX_DEPARTMENT_LINES = 25
+# Most courses listed for a topic search
+MAX_TOPIC_RESULTS = 5
+
+@app.before_request
+def start_data_watcher():
+    """Starts this process's data file watcher (after any gunicorn fork)."""
+    data_store.start_watcher(DATA_RELOAD_INTERVAL)
+
+def resolve_when(parsed):
+    """Turns the day/clock slots of an availability question into (day, minute, is_now).
+
+    minute is None when only a day was asked about.
+    """
+    now = datetime.now(LOCAL_TZ)
+    today = now.weekday()
+    if parsed.day == 'tomorrow':
+        day = WEEKDAYS[(today + 1) % 7]
+    elif parsed.day and parsed.day != 'today':
+        day = parsed.day.title()
+    else:
+        day = WEEKDAYS[today]
+
+    minute = to_minutes(*parsed.clock) if parsed.clock else None
+    if minute is None and not parsed.day:
+        return day, now.hour * 60 + now.minute, True
+    return day, minute, False
+
+def describe_when(day, minute, is_now):
+    if is_now:
+        return "right now"
+    if minute is None:
+        return f"on {day}"
+    return f"on {day} at {format_minutes(minute)}"
+
+def describe_next(office_hours, day, minute):
+    """Describes a professor's next office hours after day/minute."""
+    upcoming = next_office_hours(office_hours, day, minute or 0)
+    if upcoming is None:
+        return "I couldn't find any office hours for them this week."
+    days_ahead, next_day, interval = upcoming
+    when = f"next {next_day}" if days_ahead == 7 else next_day
+    return f"🗓️ Next office hours: **{when}**, {format_interval(interval)}."
+
+def answer_availability(parsed, current_professor):
+    """Answers "who is available now / on Monday at 11" and "when is Dr X free next".
+
+    Returns (json_response, professor), where professor is the directory
+    entry the question was about, or None for questions about everyone.
+    """
+    snapshot = get_snapshot()
+    if parsed.clock and to_minutes(*parsed.clock) is None:
+        hour, minute, meridiem = parsed.clock
+        asked = f"{hour}{f':{minute:02d}' if minute else ''}{meridiem}m" if meridiem else f"{hour}:{minute:02d}"
+        return {'response': f"🤔 I didn't understand the time **{asked}**. Try something like 2pm or 14:30."}, None
+    day, minute, is_now = resolve_when(parsed)
+    when = describe_when(day, minute, is_now)
+
+    professor = None
+    office_hours = None
+    if not parsed.anyone and parsed.name_query:
+        matches = snapshot.professor_index.search(parsed.name_query, MAX_PROFESSOR_CHOICES)
+        if not matches:
+            return {'response': f"I couldn't find a professor matching **{parsed.name_query}**."}, None
+        if needs_choice(matches):
+            return {
+                'response': choice_prompt(matches, parsed.name_query),
+                'buttons': [match.name or 'N/A' for match in matches[:MAX_PROFESSOR_CHOICES]]
+            }, None
+        professor = matches[0].to_dict()
+        office_hours = matches[0].record.office_hours
+    elif not parsed.anyone and current_professor:
+        professor = current_professor
+        matches = snapshot.professor_index.search(current_professor.get('name', ''), 1)
+        if matches and matches[0].match_type == 'exact':
+            office_hours = matches[0].record.office_hours
+        else:
+            office_hours = OfficeHours.from_json(current_professor.get('office_hours') or {})
+
+    if professor is not None:
+        prof_name = professor.get('name', 'The professor')
+        intervals = office_hours.intervals(day)
+        if minute is None:
+            if intervals:
+                ranges = ', '.join(format_interval(interval) for interval in intervals)
+                response = f"🗓️ **{prof_name}** has office hours {when}: {ranges}"
+            else:
+                response = f"🔴 **{prof_name}** has no office hours {when}.\n{describe_next(office_hours, day, None)}"
+        else:
+            current = next((interval for interval in intervals if interval[0] <= minute < interval[1]), None)
+            if current:
+                response = f"🟢 **{prof_name}** is in office hours {when}, until {format_minutes(current[1])}."
+            else:
+                response = f"🔴 **{prof_name}** has no office hours {when}.\n{describe_next(office_hours, day, minute)}"
+        return {'response': response, 'professor': professor}, professor
+
+    if minute is None:
+        entries = [(prof, ', '.join(format_interval(interval) for interval in intervals))
+                   for prof, intervals in snapshot.availability_index.on_day(day)]
+    else:
+        entries = [(prof, f"until {format_minutes(interval[1])}")
+                   for prof, interval in snapshot.availability_index.available_at(day, minute)]
+    if not entries:
+        return {'response': f"😕 Nobody has office hours {when}."}, None
+
+    response = f"🟢 **{len(entries)}** {'person has' if len(entries) == 1 else 'people have'} office hours {when}:\n\n"
+    for prof, detail in entries[:MAX_AVAILABILITY_LINES]:
+        response += f"• **{prof.name}** ({prof.department or 'N/A'}): {detail}\n"
+    if len(entries) > MAX_AVAILABILITY_LINES:
+        response += f"\n...and {len(entries) - MAX_AVAILABILITY_LINES} more."
+    return {'response': response.strip()}, None
+
+def answer_topic_search(topic_hits):
+    """Lists the courses found for a topic; a single hit becomes the session's subject."""
+    if not topic_hits:
+        return {
+            'response': "🤔 I couldn't find a course covering that. Try a topic like "
+                        "**databases** or a course code like **CS201**."
+        }, (None, None)
+    response = "🔎 These courses cover what you asked about:\n\n"
+    for hit in topic_hits:
+        course = hit.course
+        response += f"• **{course.code} - {course.name}** ({course.major}, {course.level})\n"
+        if course.description:
+            response += f"  {course.description}\n"
+    json_response = {
+        'response': response.strip(),
+        'buttons': [hit.course.code for hit in topic_hits[:4]]
+    }
+    context_update = (None, topic_hits[0].course.code if len(topic_hits) == 1 else None)
+    return json_response, context_update
+
+def answer_message(parsed, user_message, query=None):
+    """Answers a message that is not a follow-up about the current professor.
+
+    The answer depends only on the message and the loaded data. Returns
+    (json_response, context_update), where context_update is the
+    (last_professor, last_subject) pair for the session, or None to leave
+    the session context as it is. query is the spell-corrected message
+    the lookups use, user_message (the default query) the text shown back.
+    """
+    query = query or user_message
+    intent = parsed.intent
+    professor_results = None
+    subject_result = None
+
+    if parsed.major:
+        level_query = parsed.year
+        major_query = parsed.major
+        with STAGE_SECONDS.time('study_plan'):
+            plan_result = find_study_plan(major_query, level_query)
+        if plan_result:
+            response_text = f"📚 Here is the **{plan_result['level']}** plan for **{plan_result['major']}**:\n\n"
+            for code, course in plan_result['plan'].items():
+                response_text += f"• **{code}**: {course.name} ({course.credits} credits)\n"
+            response = response_text
+        else:
+            response = f"Sorry, I couldn't find a study plan for '{major_query}'."
+        return {'response': response}, None
+
+    if intent == 'department_list':
+        with STAGE_SECONDS.time('department_lookup'):
+            department = get_snapshot().department_index.find_in(query)
+        if department is None:
+            names = ', '.join(d.name for d in get_snapshot().department_index.departments.values())
+            return {'response': f"I couldn't tell which department you mean. I know about: {names}."}, None
+        members = department.members
+        response = f"👥 **{department.name}** has **{len(members)}** {'professor' if len(members) == 1 else 'professors'}:\n\n"
+        for prof in members[:MAX_DEPARTMENT_LINES]:
+            response += f"• {prof.name}\n"
+        if len(members) > MAX_DEPARTMENT_LINES:
+            response += f"\n...and {len(members) - MAX_DEPARTMENT_LINES} more."
+        return {'response': response.strip()}, None
+
+    if not parsed.course_code and intent in ('topic_search', 'course_search', 'unknown'):
+        # A message with no other keyword must use only indexed words, so names fall through
+        with STAGE_SECONDS.time('topic_search'):
+            topic_hits = find_courses_by_topic(query, match_all=intent == 'unknown')
+        if topic_hits or intent == 'topic_search':
+            LOOKUP_MATCHES.inc('topic', 'found' if topic_hits else 'none')
+            return answer_topic_search(topic_hits)
+
+    if parsed.course_code:
+        with STAGE_SECONDS.time('subject_lookup'):
+            subject_result = find_subject_info_smart(parsed.course_code)
+        LOOKUP_MATCHES.inc('course', subject_result.match_type if subject_result else 'none')
+    else:
+        # Assuming the query is for a professor if no subject code is found.
+        with STAGE_SECONDS.time('professor_lookup'):
+            professor_results = find_professor_office_hours_smart(query)
+        if not professor_results:
+            LOOKUP_MATCHES.inc('professor', 'none')
+        elif len(professor_results) > 1:
+            LOOKUP_MATCHES.inc('professor', 'multiple')
+        else:
+            LOOKUP_MATCHES.inc('professor', professor_results[0].match_type)
+
+    # The matched professor as sent to the client, also kept for follow-ups
+    professor = professor_results[0].to_dict() if professor_results and not needs_choice(professor_results) else None
+
+    # Update context after a successful search
+    if professor:
+        context_update = (professor, None)  # Clear subject context
+    elif subject_result:
+        context_update = (None, subject_result.course.code)  # Clear professor context
+    else:
+        # If no clear result or multiple matches, clear context to avoid incorrect follow-ups
+        context_update = (None, None)
+
+    with STAGE_SECONDS.time('generate_response'):
+        response_data = generate_smart_response(intent, user_message, subject_result, professor_results)
+
+    # Construct the JSON response for the frontend
+    json_response = {
+        'response': response_data.get('text', "Sorry, something went wrong.")
+    }
+
+    if 'buttons' in response_data:
+        json_response['buttons'] = response_data['buttons']
+
+    # If a single professor was found, add it to the response for context
+    if professor:
+        json_response['professor'] = professor
+
+    return json_response, context_update
+
 # Route handlers
 @app.route('/')
 def index():
@@ -417,8 +629,9 @@ def health_check():
     """Health check endpoint to verify the API is accessible."""
     try:
         # Check if data files are accessible
-        subjects_count = len(subjects_data) if subjects_data else 0
-        office_hours_count = len(office_hours_data) if office_hours_data else 0
+        snapshot = get_snapshot()
+        subjects_count = len(snapshot.course_catalog.by_major)
+        office_hours_count = len(snapshot.professors)
         
         return jsonify({
             'status': 'healthy',
@@ -427,6 +640,9 @@ def health_check():
                 'subjects': subjects_count,
                 'professors': office_hours_count
             },
+            'data_version': snapshot.version,
+            'response_cache': response_cache.stats(),
+            'data_loaded_at': datetime.fromtimestamp(snapshot.loaded_at).isoformat(),
             'timestamp': datetime.now().isoformat(),
             'version': '2.0.0'
         })
@@ -437,167 +653,358 @@ def health_check():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+class InvalidChatRequest(Exception):
+    """A chat request body that cannot be answered, reported as a 400."""
+
+def reply_to_message(data):
+    """Runs one chat request body through the pipeline.
+
+    Returns (payload, intent_label) and raises InvalidChatRequest for a
+    missing or empty message.
+    """
+    if not isinstance(data, dict) or not data:
+        raise InvalidChatRequest('No JSON data provided')
+
+    user_message = data.get('message', '')
+
+    if not isinstance(user_message, str) or not user_message.strip():
+        raise InvalidChatRequest('Empty message provided')
+    if data.get('current_professor') is not None and not isinstance(data['current_professor'], dict):
+        raise InvalidChatRequest('current_professor must be an object')
+
+    # Older clients still send the whole professor record; newer ones just a session id
+    session_id, context = session_store.get_or_create(data.get('session_id'))
+    current_professor = data.get('current_professor') or context.last_professor
+
+    # Misspelled words are corrected before routing, so "profesor" still finds a professor;
+    # replies still show the message as the user wrote it
+    with STAGE_SECONDS.time('spelling'):
+        query, _ = get_snapshot().spelling.correct(user_message)
+
+    with STAGE_SECONDS.time('parse_message'):
+        parsed = parse_message(query)
+    intent_label = parsed.intent
+    response = ""
+
+    # Availability depends on the current time, so it bypasses the response cache
+    if parsed.intent == 'availability':
+        with STAGE_SECONDS.time('availability'):
+            json_response, professor = answer_availability(parsed, current_professor)
+        if professor is not None:
+            context.last_professor, context.last_subject = professor, None
+        return session_reply(session_id, context, json_response), intent_label
+
+    # Check for follow-up questions about the current professor
+    if current_professor:
+        if parsed.followup:
+            intent_label = f'followup_{parsed.followup}'
+        prof_name = current_professor.get('name', 'The professor')
+        # Check for specific follow-up intents
+        if parsed.followup == 'colleagues':
+            department = current_professor.get('department')
+            if department:
+                colleagues = find_professors_in_department(department, prof_name)
+                if colleagues:
+                    response = f"👥 Here are other professors in the **{department}** department:\n\n"
+                    for colleague in colleagues[:10]: # Limit to 10 to avoid huge lists
+                        response += f"• {colleague}\n"
+                else:
+                    response = f"I couldn't find any other professors in the **{department}** department."
+            else:
+                response = f"I'm not sure which department **{prof_name}** is in."
+            return session_reply(session_id, context, {'response': response, 'professor': current_professor}), intent_label
+
+        if parsed.followup == 'school':
+            school = current_professor.get('school', 'I could not find their school.')
+            response = f"🏫 **{prof_name}** is in the: {school}"
+            return session_reply(session_id, context, {'response': response, 'professor': current_professor}), intent_label
+        if parsed.followup == 'email':
+            email = current_professor.get('email', 'I could not find an email for them.')
+            response = f"📧 The email for **{prof_name}** is: {email}"
+            return session_reply(session_id, context, {'response': response, 'professor': current_professor}), intent_label
+        if parsed.followup == 'office':
+            office = current_professor.get('office', 'I could not find their office number.')
+            response = f"📍 The office for **{prof_name}** is: {office}"
+            return session_reply(session_id, context, {'response': response, 'professor': current_professor}), intent_label
+        if parsed.followup == 'schedule':
+            schedule = format_schedule(current_professor.get('office_hours', {}))
+            if "No schedule" in schedule or "No specific" in schedule:
+                 response = f"🗓️ I couldn't find a specific schedule for **{prof_name}**."
+            else:
+                 response = f"🗓️ Here is the schedule for **{prof_name}**:\n{schedule}"
+            return session_reply(session_id, context, {'response': response, 'professor': current_professor}), intent_label
+
+    # --- Regular Processing ---
+    # Everything below depends only on the message and the data, so it is cached
+    cache_key = (get_snapshot().version, normalize_message(user_message))
+    with STAGE_SECONDS.time('response_cache'):
+        result = response_cache.get(cache_key)
+    if result is None:
+        result = answer_message(parsed, user_message, query)
+        response_cache.set(cache_key, result)
+
+    json_response, context_update = result
+    if context_update is not None:
+        context.last_professor, context.last_subject = context_update
+    json_response = dict(json_response)
+    if QUERY_SLOT in json_response['response']:
+        json_response['response'] = json_response['response'].replace(QUERY_SLOT, ' '.join(user_message.split()))
+    return session_reply(session_id, context, json_response), intent_label
+
+def chat_reply(data):
+    """Answers one chat request body, recording its latency and errors.
+
+    Returns (payload, status). Failures are reported in the payload, so one
+    bad message never takes down a batch.
+    """
+    started = time.perf_counter()
+    intent_label = 'invalid'
+    try:
+        payload, intent_label = reply_to_message(data)
+        return payload, 200
+    except InvalidChatRequest as e:
+        return {'error': str(e)}, 400
+    except Exception as e:
+        print(f"❌ Error in chat endpoint: {str(e)}")
+        intent_label = 'error'
+        ERRORS.inc('chat')
+        return {
+            'response': "I'm sorry, I encountered an error processing your request. Please try again.",
+            'error': str(e)
+        }, 500
+    finally:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, intent_label)
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_chat_reply(data):
+    """Streams an answer as Server-Sent Events.
+
+    A 'start' event goes out before the message is processed, then the
+    response text one line per 'delta' event, then a 'done' event with the
+    rest of the payload (session_id, buttons, professor, error) and status.
+    """
+    yield sse_event('start', {})
+    payload, status = chat_reply(data)
+    text = payload.pop('response', '')
+    for line in text.splitlines(keepends=True):
+        yield sse_event('delta', {'text': line})
+    payload['status'] = status
+    yield sse_event('done', payload)
+
+def wants_stream():
+    return request.args.get('stream') == '1' or request.accept_mimetypes.best == 'text/event-stream'
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
-    """Main chat API endpoint."""
+    """Main chat API endpoint.
+
+    Answers with one JSON object, or with Server-Sent Events when the client
+    sends `Accept: text/event-stream` (or ?stream=1).
+    """
+    data = request.get_json(silent=True)
+    if wants_stream():
+        response = app.response_class(stream_with_context(stream_chat_reply(data)), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        # Stop nginx-style proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    payload, status = chat_reply(data)
+    with STAGE_SECONDS.time('jsonify'):
+        return jsonify(payload), status
+
+@app.route('/api/chat/batch', methods=['POST'])
+def chat_batch():
+    """Answers many chat messages in one request, in order.
+
+    The body is {"messages": [...]} (or just the list), each item being an
+    /api/chat body. Items that share a session_id are answered in order, so
+    follow-ups work within a batch. Each result is the /api/chat response
+    for that item plus its 'status'.
+    """
+    data = request.get_json(silent=True)
+    messages = data.get('messages') if isinstance(data, dict) else data
+    if not isinstance(messages, list) or not messages:
+        return jsonify({'error': 'Provide a non-empty "messages" list'}), 400
+    if len(messages) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} messages per batch'}), 413
+
+    # Every message in the batch is answered from the same data snapshot
+    snapshot = get_snapshot()
+    # With NumPy, bound every message's similarity to every professor name in bulk;
+    # a message that gets spell-corrected misses this and is scored name by name
+    g.professor_overlaps = snapshot.professor_index.overlaps_many(
+        item['message'] for item in messages if isinstance(item, dict) and isinstance(item.get('message'), str)
+    )
+    results = []
+    for item in messages:
+        payload, status = chat_reply(item)
+        payload['status'] = status
+        results.append(payload)
+    with STAGE_SECONDS.time('jsonify'):
+        return jsonify({'results': results})
+
+# Fields the listing endpoints can be narrowed to with ?fields=
+PROFESSOR_FIELDS = ('name', 'department', 'school')
+COURSE_FIELDS = ('code', 'name', 'major', 'level', 'credits')
+MAX_PAGE_SIZE = 500
+
+def parse_listing_args(allowed_fields):
+    """Reads the ?fields=, ?offset= and ?limit= listing parameters.
+
+    Returns (fields, offset, limit) and raises ValueError for bad values.
+    """
+    fields = None
+    if request.args.get('fields'):
+        fields = tuple(f.strip() for f in request.args['fields'].split(',') if f.strip())
+        unknown = [f for f in fields if f not in allowed_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    range_error = f'offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}'
     try:
-        data = request.json
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-            
-        user_message = data.get('message', '')
-        current_professor = data.get('current_professor')
-        
-        if not user_message.strip():
-            return jsonify({'error': 'Empty message provided'}), 400
-            
-        message_lower = user_message.lower().strip()
-        response = ""
-
-        # Check for follow-up questions about the current professor
-        if current_professor:
-            prof_name = current_professor.get('name', 'The professor')
-            # Check for specific follow-up intents
-            if 'who else' in message_lower and 'department' in message_lower:
-                department = current_professor.get('department')
-                if department:
-                    colleagues = find_professors_in_department(department, prof_name)
-                    if colleagues:
-                        response = f"👥 Here are other professors in the **{department}** department:\n\n"
-                        for colleague in colleagues[:10]: # Limit to 10 to avoid huge lists
-                            response += f"• {colleague}\n"
-                    else:
-                        response = f"I couldn't find any other professors in the **{department}** department."
-                else:
-                    response = f"I'm not sure which department **{prof_name}** is in."
-                return jsonify({'response': response, 'professor': current_professor})
-
-            if any(word in message_lower for word in ['school', 'college', 'faculty']):
-                school = current_professor.get('school', 'I could not find their school.')
-                response = f"🏫 **{prof_name}** is in the: {school}"
-                return jsonify({'response': response, 'professor': current_professor})
-            if any(word in message_lower for word in ['email', 'contact']):
-                email = current_professor.get('email', 'I could not find an email for them.')
-                response = f"📧 The email for **{prof_name}** is: {email}"
-                return jsonify({'response': response, 'professor': current_professor})
-            if any(word in message_lower for word in ['office', 'location', 'room']):
-                office = current_professor.get('office', 'I could not find their office number.')
-                response = f"📍 The office for **{prof_name}** is: {office}"
-                return jsonify({'response': response, 'professor': current_professor})
-            if any(word in message_lower for word in ['schedule', 'hours', 'when', 'times']):
-                schedule = format_schedule(current_professor.get('office_hours', {}))
-                if "No schedule" in schedule or "No specific" in schedule:
-                     response = f"🗓️ I couldn't find a specific schedule for **{prof_name}**."
-                else:
-                     response = f"🗓️ Here is the schedule for **{prof_name}**:\n{schedule}"
-                return jsonify({'response': response, 'professor': current_professor})
+        offset = int(request.args.get('offset', 0))
+        limit = request.args.get('limit')
+        limit = int(limit) if limit is not None else None
+    except ValueError:
+        raise ValueError(range_error) from None
+    if offset < 0 or (limit is not None and not 0 < limit <= MAX_PAGE_SIZE):
+        raise ValueError(range_error)
+    return fields, offset, limit
+
+def serve_serialized(body):
+    """Serves a SerializedBody, gzip-encoded when accepted, answering 304 when still fresh."""
+    use_gzip = request.accept_encodings['gzip'] > 0
+    response = app.response_class(body.gzipped if use_gzip else body.body, mimetype='application/json')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    response.set_etag(body.gzip_etag if use_gzip else body.etag)
+    if body.last_modified:
+        response.last_modified = body.last_modified
+    # Browsers may keep the body but must revalidate, which is a cheap 304
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def listing_item(record, fields):
+    """Picks the listed fields off a Professor or Course record."""
+    item = {}
+    for field in fields:
+        value = getattr(record, field)
+        item[field] = '' if value is None else value
+    return item
+
+def listing_response(name, records, allowed_fields, source_path, scope=None):
+    """Serves a catalog listing, serialized once per snapshot and parameter set.
+
+    scope names the subset records is (e.g. a department) for the cache key.
+    """
+    try:
+        fields, offset, limit = parse_listing_args(allowed_fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        # --- Regular Processing ---
-        intent = extract_intent(message_lower)
-        subject_code_match = re.search(r'([a-zA-Z]{2,4}\s*\d{3})', user_message)
-        study_plan_match = re.search(r'(show|tell|give|what is|find)\s+(me\s+)?(the\s+)?(first|second|third|fourth|fifth|1st|2nd|3rd|4th|5th)\s+year\s+(plan\s+)?(for\s+)?([a-zA-Z\s]+)', message_lower)
+    snapshot = get_snapshot()
 
-        professor_results = None
-        subject_result = None
-        
-        if study_plan_match:
-            level_query = study_plan_match.group(4)
-            major_query = study_plan_match.group(7)
-            plan_result = find_study_plan(major_query, level_query)
-            if plan_result:
-                response_text = f"📚 Here is the **{plan_result['level']}** plan for **{plan_result['major']}**:\n\n"
-                for code, details in plan_result['plan'].items():
-                    response_text += f"• **{code}**: {details['name']} ({details['credits']} credits)\n"
-                response = response_text
-            else:
-                response = f"Sorry, I couldn't find a study plan for '{major_query}'."
-            return jsonify({'response': response})
+    def build():
+        page = records[offset:offset + limit] if limit is not None else records[offset:]
+        page = [listing_item(record, fields or allowed_fields) for record in page]
+        payload = {name: page}
+        if offset or limit is not None:
+            payload.update(total=len(records), offset=offset, limit=limit)
+        return SerializedBody.from_mtime_ns(payload, snapshot.source_mtimes.get(source_path))
 
-        if subject_code_match:
-            subject_result = find_subject_info_smart(subject_code_match.group(1))
-        else:
-            # Assuming the query is for a professor if no subject code is found.
-            professor_results = find_professor_office_hours_smart(user_message)
-
-        # Update context after a successful search
-        if professor_results and len(professor_results) == 1:
-            context.last_professor = professor_results[0]
-            context.last_subject = None  # Clear subject context
-        elif subject_result:
-            context.last_subject = subject_result
-            context.last_professor = None  # Clear professor context
-        else:
-            # If no clear result or multiple matches, clear context to avoid incorrect follow-ups
-            context.last_professor = None
-            context.last_subject = None
+    return serve_serialized(snapshot.serialized((name, scope, fields, offset, limit), build))
 
-        response_data = generate_smart_response(intent, user_message, subject_result, professor_results)
-        
-        # Construct the JSON response for the frontend
-        json_response = {
-            'response': response_data.get('text', "Sorry, something went wrong.")
-        }
+@app.route('/api/professors')
+def get_professors():
+    """Get all professors for autocomplete or listing.
+
+    ?department= narrows the listing to one department, in directory order.
+    """
+    try:
+        snapshot = get_snapshot()
+        records = snapshot.professors
+        scope = None
+        if request.args.get('department'):
+            department = snapshot.department_index.get(request.args['department'])
+            if department is None:
+                return jsonify({'error': f"Unknown department: {request.args['department']}"}), 404
+            records = department.members
+            scope = department.name
+        return listing_response('professors', records,
+                                PROFESSOR_FIELDS, data_store.office_hours_path, scope)
+    except Exception as e:
+        ERRORS.inc('professors')
+        return jsonify({'error': str(e)}), 500
 
-        if 'buttons' in response_data:
-            json_response['buttons'] = response_data['buttons']
+@app.route('/api/suggest')
+def suggest():
+    """Autocomplete suggestions for professor names, course codes and course titles.
 
-        # If a single professor was found, add it to the response for context
-        if professor_results and len(professor_results) == 1:
-            json_response['professor'] = professor_results[0]
-        
-        return jsonify(json_response)
-        
+    ?q= is the text typed so far; ?limit= (default 5, at most 20) caps the results.
+    """
+    try:
+        limit = int(request.args.get('limit', 5))
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+    if not 0 < limit <= MAX_SUGGESTIONS:
+        return jsonify({'error': f'limit must be between 1 and {MAX_SUGGESTIONS}'}), 400
+
+    try:
+        with STAGE_SECONDS.time('suggest'):
+            suggestions = get_snapshot().suggest_index.suggest(request.args.get('q', ''), limit)
+        return jsonify({'suggestions': [suggestion.to_json() for suggestion in suggestions]})
     except Exception as e:
-        print(f"❌ Error in chat endpoint: {str(e)}")
-        return jsonify({
-            'response': "I'm sorry, I encountered an error processing your request. Please try again.",
-            'error': str(e)
-        }), 500
+        ERRORS.inc('suggest')
+        return jsonify({'error': str(e)}), 500
 
-@app.route('/api/professors')
-def get_professors():
-    """Get all professors for autocomplete or listing."""
+@app.route('/api/departments')
+def get_departments():
+    """Get schools and their departments with professor counts, for filters."""
     try:
-        if not office_hours_data:
-            return jsonify({'professors': []})
-        
-        professors = []
-        for prof in office_hours_data:
-            professors.append({
-                'name': prof.get('name', ''),
-                'department': prof.get('department', ''),
-                'school': prof.get('school', '')
-            })
-        
-        return jsonify({'professors': professors})
+        snapshot = get_snapshot()
+
+        def build():
+            payload = {'schools': snapshot.department_index.to_json()}
+            return SerializedBody.from_mtime_ns(payload, snapshot.source_mtimes.get(data_store.office_hours_path))
+
+        return serve_serialized(snapshot.serialized(('departments',), build))
     except Exception as e:
+        ERRORS.inc('departments')
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/courses')
 def get_courses():
     """Get all courses for autocomplete or listing."""
     try:
-        if not subjects_data:
-            return jsonify({'courses': []})
-        
-        courses = []
-        for major, levels in subjects_data.items():
-            for level, subjects in levels.items():
-                for code, details in subjects.items():
-                    courses.append({
-                        'code': code,
-                        'name': details.get('name', ''),
-                        'major': major,
-                        'level': level,
-                        'credits': details.get('credits', '')
-                    })
-        
-        return jsonify({'courses': courses})
+        snapshot = get_snapshot()
+        return listing_response('courses', snapshot.course_catalog.entries,
+                                COURSE_FIELDS, data_store.subjects_path)
+    except Exception as e:
+        ERRORS.inc('courses')
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics for this worker process."""
+    return app.response_class(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_data():
+    """Re-reads the JSON data files and swaps in the new snapshot."""
+    auth = request.headers.get('Authorization', '')
+    if not ADMIN_TOKEN or not hmac.compare_digest(auth, f'Bearer {ADMIN_TOKEN}'):
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        reloaded = data_store.reload(force=True)
+        return jsonify({'reloaded': reloaded, 'data_version': data_store.snapshot.version})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    # Add both JSON files to 'extra_files' to trigger auto-reload on change
-    json_files = ['office_hours.json', 'full_subjects_study_plan.json']
+    # The JSON files are picked up by the data watcher, no restart needed
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=True, host='0.0.0.0', port=port, extra_files=json_files)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""ASGI entry point, for serving the app with an ASGI server such as uvicorn.
+
+    pip install asgiref uvicorn
+    uvicorn asgi:application --workers 2
+
+Flask is a WSGI app; WsgiToAsgi runs each request on a thread pool, so one
+worker process serves many requests at once over a single copy of the data.
+"""
+import sys
+import os
+
+path = os.path.dirname(os.path.abspath(__file__))
+if path not in sys.path:
+    sys.path.append(path)
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app
+
+application = WsgiToAsgi(flask_app)
@@ -0,0 +1,157 @@
+"""Office hours as minute intervals, and an index answering "who is available when".
+
+Schedules in office_hours.json are free text per day, e.g.
+"10:00 AM - 1:00 PM, 2:30 PM - 3:00 PM Iman office". They are parsed once
+at load time into (start, end) minutes since midnight; AvailabilityIndex
+then answers "who is in office hours on Monday at 11" with a binary search.
+"""
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Office hours fall inside the working day; times outside it are AM/PM typos
+# in the source ("11:30 PM - 1:00 PM") and get their meridiem flipped.
+WORKDAY_START = 7 * 60
+WORKDAY_END = 20 * 60
+
+_RANGE_RE = re.compile(
+    r'(\d{1,2})(?::(\d{2}))?\s*([AaPp])?\.?[Mm]?\.?\s*[-–—]\s*'
+    r'(\d{1,2})(?::(\d{2}))?\s*([AaPp])?\.?[Mm]?\.?'
+)
+
+
+def to_minutes(hour, minute=0, meridiem=None):
+    """Converts a clock time to minutes since midnight, or None if it is not a time.
+
+    meridiem is 'a', 'p' or None. Without one, hours 7-11 are taken as
+    morning and 12-6 as afternoon, as office hours are in the working day.
+    """
+    if minute > 59:
+        return None
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    elif hour > 23:
+        return None
+    elif 1 <= hour < 7:
+        hour += 12
+    return hour * 60 + minute
+
+
+def _workday_minutes(hour, minute, meridiem):
+    minutes = to_minutes(hour, minute, meridiem)
+    if minutes is not None and meridiem and not WORKDAY_START <= minutes <= WORKDAY_END:
+        flipped = to_minutes(hour, minute, 'a' if meridiem.lower() == 'p' else 'p')
+        if WORKDAY_START <= flipped <= WORKDAY_END:
+            return flipped
+    return minutes
+
+
+@lru_cache(maxsize=4096)
+def parse_time_ranges(text):
+    """Parses a day's schedule text into a sorted tuple of (start, end) minutes.
+
+    Text that is not a time range ("On Teams", notes after the times) is
+    ignored. Identical strings share one cached tuple.
+    """
+    if not isinstance(text, str):
+        return ()
+    intervals = []
+    for match in _RANGE_RE.finditer(text):
+        start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+        start = _workday_minutes(int(start_hour), int(start_minute or 0), start_meridiem)
+        end = _workday_minutes(int(end_hour), int(end_minute or 0), end_meridiem)
+        if start is not None and end is not None and start < end:
+            intervals.append((start, end))
+    return tuple(sorted(intervals))
+
+
+def format_minutes(minutes):
+    """Formats minutes since midnight as "11:30 AM"."""
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_interval(interval):
+    return f"{format_minutes(interval[0])} - {format_minutes(interval[1])}"
+
+
+def next_office_hours(office_hours, day, minute):
+    """Finds a professor's next office hours at or after day/minute.
+
+    Returns (days_ahead, day, interval), where days_ahead is 0 for today
+    (and the interval may already be in progress), or None if the
+    professor has no parsable office hours.
+    """
+    today = WEEKDAYS.index(day)
+    for days_ahead in range(8):
+        weekday = WEEKDAYS[(today + days_ahead) % 7]
+        for interval in office_hours.intervals(weekday):
+            if days_ahead > 0 or interval[1] > minute:
+                return days_ahead, weekday, interval
+    return None
+
+
+class AvailabilityIndex:
+    """Per-day interval index over the directory's office hours.
+
+    Each day's interval endpoints split it into segments; every segment
+    stores the professors in office hours throughout it, in directory order.
+    A point query is one bisect into the segment boundaries.
+    """
+
+    def __init__(self, professors):
+        self.professors = professors
+        self._days = {}
+
+        for day in WEEKDAYS:
+            events = []
+            scheduled = []
+            for idx, prof in enumerate(professors):
+                intervals = prof.office_hours.intervals(day)
+                if intervals:
+                    scheduled.append(idx)
+                for start, end in intervals:
+                    events.append((start, 1, idx))
+                    events.append((end, -1, idx))
+            if not events:
+                continue
+            events.sort()
+            boundaries = []
+            segments = []
+            active = {}
+            for i, (point, delta, idx) in enumerate(events):
+                # A professor can have overlapping ranges, so count them
+                active[idx] = active.get(idx, 0) + delta
+                if not active[idx]:
+                    del active[idx]
+                if i + 1 == len(events) or events[i + 1][0] != point:
+                    boundaries.append(point)
+                    segments.append(tuple(sorted(active)))
+            # The last boundary closes every interval; nothing starts there
+            self._days[day] = (boundaries, segments[:-1], tuple(scheduled))
+
+    def available_at(self, day, minute):
+        """Returns (professor, interval) pairs for everyone in office hours at day/minute."""
+        boundaries, segments, _ = self._days.get(day, ((), (), ()))
+        i = bisect_right(boundaries, minute) - 1
+        if i < 0 or i >= len(segments):
+            return []
+        results = []
+        for idx in segments[i]:
+            prof = self.professors[idx]
+            for interval in prof.office_hours.intervals(day):
+                if interval[0] <= minute < interval[1]:
+                    results.append((prof, interval))
+                    break
+        return results
+
+    def on_day(self, day):
+        """Returns (professor, intervals) pairs for everyone with office hours on day."""
+        if day not in self._days:
+            return []
+        return [(self.professors[idx], self.professors[idx].office_hours.intervals(day))
+                for idx in self._days[day][2]]
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Offline replay benchmark for the chat pipeline.
+
+Drives the lookup functions directly and the full /api/chat endpoint through
+app.test_client() with a generated query corpus (course codes, typos,
+professor names, study plan phrasings, follow-ups), against the real data or
+a synthetic directory of any size. Reports throughput, p50/p95/p99 latency
+and allocations per stage, and stores the results as JSON so runs can be compared.
+
+    python benchmark.py                          # real data
+    python benchmark.py --sizes 1000,10000       # synthetic directories
+    python benchmark.py --output run.json --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import app
+from data_store import DataStore
+from intent_engine import parse_message
+
+FIRST_NAMES = ['Ahmed', 'Mohammad', 'Omar', 'Sara', 'Lina', 'Yousef', 'Rania', 'Khaled', 'Hana', 'Islam',
+               'Tasnim', 'Asma', 'Malek', 'Israa', 'Zaid', 'Noor', 'Dana', 'Faisal', 'Aseel', 'Hamza']
+LAST_NAMES = ['Bataineh', 'Alkhateeb', 'Al-Omari', 'Saadeh', 'Allouzi', 'Sabbah', 'Haddad', 'Mousa',
+              'Al-Harasis', 'Yahia', 'Abu Haq', 'Qasem', 'Nasser', 'Shawabkeh', 'Zoubi', 'Masri']
+DEPARTMENTS = ['Computer Science', 'Cyber Security', 'AI and Data Science', 'Software Engineering',
+               'Electrical Engineering', 'Mechanical Engineering', 'Business']
+PREFIXES = ['CS', 'CYS', 'AI', 'SE', 'EE', 'ME', 'BUS', 'MATH', 'PHY', 'NET']
+LEVELS = ['Level 1', 'Level 2', 'Level 3', 'Level 4']
+DAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday']
+TOPICS = ['Programming', 'Databases', 'Networks', 'Security', 'Algorithms', 'Operating Systems',
+          'Machine Learning', 'Circuits', 'Statistics', 'Web Development']
+
+
+def generate_directory(size, seed=0):
+    """Builds synthetic office hours and study plan data with `size` professors and courses."""
+    rnd = random.Random(seed)
+    professors = []
+    for i in range(size):
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        middle = rnd.choice(FIRST_NAMES) + ' ' if rnd.random() < 0.4 else ''
+        # Suffix keeps names unique once the combinations run out
+        name = f"{first} {middle}{last}" + (f" {i}" if i >= 2000 else '')
+        professors.append({
+            'name': name,
+            'school': 'School of Computing and Informatics',
+            'department': rnd.choice(DEPARTMENTS),
+            'email': f"{first.lower()}.{last.lower().replace(' ', '')}{i}@htu.edu.jo",
+            'office': f"S-{rnd.randint(100, 399)}",
+            'office_hours': {day: f"{rnd.randint(8, 12)}:00 AM - 1:00 PM"
+                             for day in rnd.sample(DAYS, 3)}
+        })
+
+    subjects = {}
+    for i in range(size):
+        major = DEPARTMENTS[i % len(DEPARTMENTS)]
+        level = LEVELS[(i // len(DEPARTMENTS)) % len(LEVELS)]
+        # Unique codes the app's parser reads back whole: two to four letters and three digits
+        prefix, number = PREFIXES[i % len(PREFIXES)], 100 + i // len(PREFIXES) % 900
+        block = i // (len(PREFIXES) * 900)
+        code = f"{prefix[:3]}{chr(65 + (block - 1) % 26)}{number}" if block else f"{prefix}{number}"
+        topic = rnd.choice(TOPICS)
+        subjects.setdefault(major, {}).setdefault(level, {})[code] = {
+            'name': f"{topic} {i}",
+            'description': f"Covers {topic.lower()} concepts and practice.",
+            'credits': rnd.choice([1, 2, 3])
+        }
+    return subjects, professors
+
+
+def typo(text, rnd):
+    """Applies one random edit (delete, replace, insert or O/0 swap) to text."""
+    chars = list(text)
+    i = rnd.randrange(len(chars))
+    op = rnd.choice(['delete', 'replace', 'insert', 'swap'])
+    if op == 'delete' and len(chars) > 2:
+        del chars[i]
+    elif op == 'replace':
+        chars[i] = rnd.choice('abcdefghijklmnopqrstuvwxyz')
+    elif op == 'insert':
+        chars.insert(i, rnd.choice('abcdefghijklmnopqrstuvwxyz'))
+    else:
+        return text.replace('0', 'O', 1) if '0' in text else text.replace('1', 'l', 1)
+    return ''.join(chars)
+
+
+def generate_corpus(snapshot, count, seed=0):
+    """Generates (kind, message, follow_up) tuples mirroring production traffic."""
+    rnd = random.Random(seed)
+    names = [p.name for p in snapshot.professors if p.name]
+    codes = [course.code for course in snapshot.course_catalog.entries]
+    majors = list(snapshot.course_catalog.by_major) or ['computer science']
+    follow_ups = ['What is their email?', 'Where is their office?', 'When are their office hours?',
+                  'Which school are they in?', 'Who else is in this department?']
+    weights = [('course_code', 25), ('course_typo', 15), ('professor_name', 20), ('professor_partial', 10),
+               ('professor_typo', 10), ('study_plan', 5), ('follow_up', 10), ('help', 5)]
+    kinds = [kind for kind, weight in weights for _ in range(weight)]
+
+    corpus = []
+    for _ in range(count):
+        kind = rnd.choice(kinds)
+        follow_up = None
+        if kind == 'course_code' and codes:
+            message = rnd.choice(codes)
+        elif kind == 'course_typo' and codes:
+            message = typo(rnd.choice(codes), rnd)
+        elif kind == 'professor_name' and names:
+            message = rnd.choice(names)
+        elif kind == 'professor_partial' and names:
+            message = rnd.choice(rnd.choice(names).split())
+        elif kind == 'professor_typo' and names:
+            message = typo(rnd.choice(names), rnd)
+        elif kind == 'study_plan':
+            message = f"show me the {rnd.choice(['first', 'second', '3rd'])} year plan for {rnd.choice(majors).lower()}"
+        elif kind == 'follow_up' and names:
+            message = rnd.choice(names)
+            follow_up = rnd.choice(follow_ups)
+        else:
+            kind, message = 'help', rnd.choice(['help', 'What can you do?', 'hello'])
+        corpus.append((kind, message, follow_up))
+    return corpus
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, allocations):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'throughput_per_s': round(len(latencies) / total, 1) if total else 0.0,
+        'mean_us': round(total / len(latencies) * 1e6, 2) if latencies else 0.0,
+        'p50_us': round(percentile(latencies, 50) * 1e6, 2),
+        'p95_us': round(percentile(latencies, 95) * 1e6, 2),
+        'p99_us': round(percentile(latencies, 99) * 1e6, 2),
+        'alloc_peak_kb': round(sum(allocations) / len(allocations) / 1024, 2) if allocations else 0.0,
+    }
+
+
+def run_stage(fn, inputs, alloc_sample):
+    """Times fn over inputs, then measures peak allocation on a sample with tracemalloc."""
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+
+    allocations = []
+    tracemalloc.start()
+    for item in inputs[:alloc_sample]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn(item)
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return summarize(latencies, allocations)
+
+
+def chat_request(client, message, session_id=None):
+    body = {'message': message}
+    if session_id:
+        body['session_id'] = session_id
+    return client.post('/api/chat', json=body).get_json()
+
+
+def benchmark_snapshot(label, queries, alloc_sample, use_cache):
+    snapshot = app.data_store.snapshot
+    corpus = generate_corpus(snapshot, queries)
+    messages = [message for _, message, _ in corpus]
+    parsed = [parse_message(message) for message in messages]
+    codes = [p.course_code for p in parsed if p.course_code]
+    names = [message for p, message in zip(parsed, messages) if not p.course_code and not p.major]
+
+    if not use_cache:
+        app.response_cache.max_entries = 0
+    app.response_cache.clear()
+    client = app.app.test_client()
+
+    def full_request(item):
+        _, message, follow_up = item
+        reply = chat_request(client, message)
+        if follow_up:
+            chat_request(client, follow_up, reply.get('session_id'))
+
+    stages = {
+        'parse_message': run_stage(parse_message, messages, alloc_sample),
+        'find_subject_info_smart': run_stage(app.find_subject_info_smart, codes, alloc_sample),
+        'find_professor_office_hours_smart': run_stage(app.find_professor_office_hours_smart, names, alloc_sample),
+        'answer_message': run_stage(lambda message: app.answer_message(parse_message(message), message),
+                                    messages, alloc_sample),
+        'http_chat': run_stage(full_request, corpus, alloc_sample),
+    }
+    kinds = {}
+    for kind, _, _ in corpus:
+        kinds[kind] = kinds.get(kind, 0) + 1
+    return {
+        'label': label,
+        'professors': len(snapshot.professors),
+        'courses': len(snapshot.course_catalog),
+        'queries': len(corpus),
+        'corpus_mix': kinds,
+        'response_cache': use_cache,
+        'stages': stages,
+    }
+
+
+def load_synthetic(size, workdir):
+    subjects, professors = generate_directory(size)
+    subjects_path = os.path.join(workdir, f'subjects_{size}.json')
+    office_hours_path = os.path.join(workdir, f'office_hours_{size}.json')
+    with open(subjects_path, 'w', encoding='utf-8') as f:
+        json.dump(subjects, f)
+    with open(office_hours_path, 'w', encoding='utf-8') as f:
+        json.dump(professors, f)
+    start = time.perf_counter()
+    app.data_store = DataStore(subjects_path, office_hours_path)
+    return time.perf_counter() - start
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run):
+    print(f"\n📊 {run['label']}: {run['professors']} professors, {run['courses']} courses, "
+          f"{run['queries']} queries (cache {'on' if run['response_cache'] else 'off'})")
+    if 'load_s' in run:
+        print(f"   load + index: {run['load_s']:.3f}s")
+    print(f"   {'stage':<36}{'calls':>7}{'ops/s':>11}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'peak KB':>10}")
+    for name, stats in run['stages'].items():
+        print(f"   {name:<36}{stats['calls']:>7}{stats['throughput_per_s']:>11}{stats['p50_us']:>10}"
+              f"{stats['p95_us']:>10}{stats['p99_us']:>10}{stats['alloc_peak_kb']:>10}")
+
+
+def print_comparison(results, baseline):
+    previous = {run['label']: run for run in baseline.get('runs', [])}
+    print(f"\n🔁 Compared with {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp', '?')})")
+    for run in results['runs']:
+        old = previous.get(run['label'])
+        if not old:
+            continue
+        print(f"   {run['label']}")
+        for name, stats in run['stages'].items():
+            old_stats = old['stages'].get(name)
+            if not old_stats or not old_stats['p95_us']:
+                continue
+            change = (stats['p95_us'] - old_stats['p95_us']) / old_stats['p95_us'] * 100
+            flag = '⚠️ ' if change > 10 else '   '
+            print(f"   {flag}{name:<36} p95 {old_stats['p95_us']:>10} → {stats['p95_us']:>10} µs ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay benchmark for the HTU Assistant chat pipeline.')
+    parser.add_argument('--queries', type=int, default=2000, help='queries per run')
+    parser.add_argument('--sizes', default='', help='comma-separated synthetic directory sizes, e.g. 1000,10000')
+    parser.add_argument('--skip-real', action='store_true', help='skip the run against the real JSON data')
+    parser.add_argument('--alloc-sample', type=int, default=200, help='calls per stage traced for allocations')
+    parser.add_argument('--cache', action='store_true', help='leave the response cache on')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    # Benchmarks swap data stores directly; no file watcher needed
+    app.DATA_RELOAD_INTERVAL = 0
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'runs': [],
+    }
+
+    if not args.skip_real:
+        results['runs'].append(benchmark_snapshot('real', args.queries, args.alloc_sample, args.cache))
+        print_run(results['runs'][-1])
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            load_s = load_synthetic(size, workdir)
+            run = benchmark_snapshot(f'synthetic-{size}', args.queries, args.alloc_sample, args.cache)
+            run['load_s'] = round(load_s, 3)
+            results['runs'].append(run)
+            print_run(run)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Character count vectors of many strings in one NumPy matrix.
+
+NumPy is optional: without it CharMatrix.available is False and callers
+score strings pairwise with calculate_similarity as before.
+
+Row i has a 1 in column (c, k) when string i has at least k copies of
+character c, so the dot product of two rows is the number of characters
+the strings have in common (as multisets). That count is what
+SequenceMatcher.quick_ratio() is built from, and 2 * common / (len(a) +
+len(b)) is an upper bound on ratio(), so screening on it never drops a
+pair that calculate_similarity would score above a threshold. Scoring a
+query against every string is one matrix-vector product, and a batch of
+queries one matrix product.
+"""
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, pairwise scoring is used instead
+    np = None
+
+# Queries scored per matrix product by overlaps_many(), bounding the result size
+BATCH_ROWS = 256
+
+
+def _features(text):
+    return [(char, k) for char, count in Counter(text).items() for k in range(1, count + 1)]
+
+
+class CharMatrix:
+    """Character count vectors of a list of strings, for bulk similarity bounds."""
+
+    available = np is not None
+
+    def __init__(self, texts):
+        self.columns = {}
+        rows = []
+        for text in texts:
+            rows.append([self.columns.setdefault(feature, len(self.columns)) for feature in _features(text)])
+
+        # Counts are small integers, exact in float32, which keeps the products on BLAS
+        self.matrix = np.zeros((len(rows), max(len(self.columns), 1)), dtype=np.float32)
+        for i, columns in enumerate(rows):
+            self.matrix[i, columns] = 1
+        self.lengths = np.array([len(text) for text in texts], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def vector(self, text):
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        columns = [self.columns[feature] for feature in _features(text) if feature in self.columns]
+        vector[columns] = 1
+        return vector
+
+    def overlaps(self, text):
+        """Returns the number of characters text shares with every row."""
+        return self.matrix @ self.vector(text)
+
+    def overlaps_many(self, texts):
+        """Yields (text, overlaps) for each distinct text, BATCH_ROWS queries per product."""
+        texts = list(dict.fromkeys(texts))
+        for start in range(0, len(texts), BATCH_ROWS):
+            chunk = texts[start:start + BATCH_ROWS]
+            products = np.stack([self.vector(text) for text in chunk]) @ self.matrix.T
+            yield from zip(chunk, products)
+
+    def bounds(self, text, overlaps, rows):
+        """Returns upper bounds on calculate_similarity(text, ...) for the given rows.
+
+        overlaps is text's overlaps() row. A row and text must not both be empty.
+        """
+        return 2.0 * overlaps[rows] / (self.lengths[rows] + len(text))
@@ -0,0 +1,57 @@
+from typing import NamedTuple
+
+from course_matcher import CourseCodeMatcher
+from records import Course
+
+
+class CourseMatch(NamedTuple):
+    """A course lookup hit: a reference to the catalog record plus how it matched."""
+    course: Course
+    match_type: str
+    similarity: float
+
+
+class CourseCatalog:
+    """Flat views over the nested major -> level -> subjects study plan.
+
+    Built once from full_subjects_study_plan.json so that exact course code
+    lookups are a single dictionary hit and fuzzy ones go through a BK-tree.
+    Every view references the same Course records.
+    """
+
+    def __init__(self, subjects_data):
+        self.by_code = {}
+        self.entries = []
+        self.by_major = {}
+        self._major_keys = []
+
+        for major, levels in (subjects_data or {}).items():
+            self._major_keys.append((major.lower(), major))
+            major_view = self.by_major.setdefault(major, {})
+            for level, subjects in levels.items():
+                level_view = major_view.setdefault(level, {})
+                for code, details in subjects.items():
+                    entry = Course.from_json(code, major, level, details)
+                    # The first major listing a code wins, as in the nested walk
+                    self.by_code.setdefault(code, entry)
+                    self.entries.append(entry)
+                    level_view[code] = entry
+
+        self.code_matcher = CourseCodeMatcher(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, code):
+        """Returns the Course for an exact code, or None."""
+        return self.by_code.get(code.upper())
+
+    def find_plan(self, major_query, level):
+        """Finds the first major containing the lowercased query that offers the level.
+
+        Returns (major, code -> Course view), or (None, None).
+        """
+        for major_lower, major in self._major_keys:
+            if major_query in major_lower and level in self.by_major[major]:
+                return major, self.by_major[major][level]
+        return None, None
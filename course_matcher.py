@@ -0,0 +1,131 @@
+from text_utils import SimilarityScorer
+
+FUZZY_THRESHOLD = 0.6
+
+
+def levenshtein(a, b):
+    """Returns the edit distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree for radius queries under an integer metric."""
+
+    def __init__(self, distance=levenshtein):
+        self.distance = distance
+        self.root = None
+        self.size = 0
+
+    def add(self, item):
+        if self.root is None:
+            self.root = (item, {})
+            self.size = 1
+            return
+        node_item, children = self.root
+        while True:
+            dist = self.distance(item, node_item)
+            if dist == 0:
+                return
+            child = children.get(dist)
+            if child is None:
+                children[dist] = (item, {})
+                self.size += 1
+                return
+            node_item, children = child
+
+    def search(self, item, radius, distances=None):
+        """Returns (distance, item) pairs for every item within radius.
+
+        distances, if given, memoizes the distances from item to the nodes
+        visited, for repeated searches around the same item.
+        """
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_item, children = stack.pop()
+            if distances is None:
+                dist = self.distance(item, node_item)
+            else:
+                dist = distances.get(node_item)
+                if dist is None:
+                    dist = distances[node_item] = self.distance(item, node_item)
+            if dist <= radius:
+                found.append((dist, node_item))
+            for child_dist, child in children.items():
+                if dist - radius <= child_dist <= dist + radius:
+                    stack.append(child)
+        return found
+
+
+class CourseCodeMatcher:
+    """Fuzzy "did you mean" matcher over course codes.
+
+    Scores are the same SequenceMatcher ratios calculate_similarity gives,
+    but only codes the BK-tree finds within reach are scored. A ratio above
+    the threshold needs fewer than (1 - threshold) * (len(a) + len(b))
+    insertions/deletions, and the edit distance is never more than that, so
+    the radius search cannot drop a code that would have scored above it.
+    """
+
+    def __init__(self, entries, threshold=FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self._first = {}
+        for position, entry in enumerate(entries):
+            self._first.setdefault(entry.code.lower(), (position, entry))
+        self._max_len = max((len(key) for key in self._first), default=0)
+        self._tree = BKTree()
+        for key in self._first:
+            self._tree.add(key)
+
+    def __len__(self):
+        return self._tree.size
+
+    def top_k(self, query, k=5):
+        """Returns up to k (course entry, similarity) pairs above the threshold, best first."""
+        query_lower = query.lower()
+        total_len = len(query_lower) + self._max_len
+        max_radius = int((1 - self.threshold) * total_len + 1e-9)
+
+        scorer = SimilarityScorer(query)
+        distances = {}
+        hits = []
+        seen = set()
+        # Widen the search one edit at a time: a code at edit distance d
+        # scores at most (total_len - d) / total_len, so stop once that
+        # cannot beat the k-th best hit found so far. Computed as one
+        # division, as ratio() is; 1 - d / total_len can round below an
+        # equal ratio and drop a tie.
+        for radius in range(max_radius + 1):
+            if len(hits) >= k and (total_len - radius) / total_len < hits[k - 1][0]:
+                break
+            for _, key in self._tree.search(query_lower, radius, distances):
+                if key in seen:
+                    continue
+                seen.add(key)
+                position, entry = self._first[key]
+                # Codes that cannot reach the k-th best hit are not scored in full
+                floor = max(self.threshold, hits[k - 1][0]) if len(hits) >= k else self.threshold
+                similarity = scorer.score(entry.code, floor)
+                if similarity is not None and similarity > self.threshold:
+                    hits.append((similarity, position, entry))
+            # Ties go to the code listed first in the study plan
+            hits.sort(key=lambda hit: (-hit[0], hit[1]))
+
+        return [(entry, similarity) for similarity, _, entry in hits[:k]]
+
+    def best(self, query):
+        """Returns the best (course entry, similarity) pair, or None."""
+        hits = self.top_k(query, k=1)
+        return hits[0] if hits else None
@@ -0,0 +1,126 @@
+"""BM25 topic search over course names and descriptions.
+
+Answers questions like "which course covers SQL" or "operating systems
+class" that name a topic instead of a course code. Every term's BM25
+weight in every course is computed at load time, so a query only sums
+the precomputed weights in its terms' posting lists.
+"""
+import heapq
+import math
+import re
+
+from text_utils import normalize_name, tokenize
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+# A term in a course name counts this many times over one in its description
+NAME_WEIGHT = 3
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'including', 'into', 'is',
+    'it', 'its', 'of', 'on', 'or', 'the', 'their', 'this', 'to', 'with', 'using', 'such',
+}
+# Question words that say what is being asked for rather than the topic
+QUERY_FILLER = STOPWORDS | {
+    'which', 'what', 'where', 'who', 'any', 'there', 'do', 'does', 'can', 'i', 'me', 'we', 'you', 'my',
+    'course', 'courses', 'class', 'classes', 'subject', 'subjects', 'cover', 'covers', 'covered',
+    'teach', 'teaches', 'taught', 'learn', 'study', 'topic', 'topics', 'find', 'show',
+    'tell', 'about', 'want', 'take', 'need', 'has', 'have', 'that', 'help', 'please',
+}
+
+_DOUBLE_CONSONANT_RE = re.compile(r'([bcdfgkmnprt])\1$')
+
+
+def stem(word):
+    """Strips common English inflections so "networks" and "networking" meet "network".
+
+    A light suffix stripper rather than a full Porter stemmer: it only has
+    to map the forms course descriptions and questions actually use onto
+    one key, and never needs to produce a real word.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('sses'):
+        return word[:-2]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # "programming" -> "program", "mapped" -> "map"
+            return word[:-1] if _DOUBLE_CONSONANT_RE.search(word) else word
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def search_terms(text, skip=STOPWORDS):
+    """Tokenizes and stems text, dropping the words in skip."""
+    return [stem(token) for token in tokenize(normalize_name(text)) if token not in skip]
+
+
+class TopicHit:
+    __slots__ = ('course', 'score')
+
+    def __init__(self, course, score):
+        self.course = course
+        self.score = score
+
+
+class CourseSearchIndex:
+    """Inverted index from stemmed terms to (course, BM25 weight) postings.
+
+    A course's document is its name (counted NAME_WEIGHT times) followed by
+    its description. Each course code is indexed once, under the first
+    major that lists it, as in CourseCatalog.by_code.
+    """
+
+    def __init__(self, courses):
+        self.courses = list(courses)
+        self.postings = {}
+
+        documents = []
+        for course in self.courses:
+            counts = {}
+            for term in search_terms(course.name or ''):
+                counts[term] = counts.get(term, 0) + NAME_WEIGHT
+            for term in search_terms(course.description or ''):
+                counts[term] = counts.get(term, 0) + 1
+            documents.append(counts)
+
+        total = len(documents)
+        lengths = [sum(counts.values()) for counts in documents]
+        average = sum(lengths) / total if total else 0
+        frequencies = {}
+        for counts in documents:
+            for term in counts:
+                frequencies[term] = frequencies.get(term, 0) + 1
+
+        for idx, counts in enumerate(documents):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[idx] / average)
+            for term, tf in counts.items():
+                df = frequencies[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                weight = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                self.postings.setdefault(term, []).append((idx, weight))
+
+    def __len__(self):
+        return len(self.courses)
+
+    def search(self, query, limit=5, match_all=False):
+        """Returns up to limit TopicHits for the query's topic words, best first.
+
+        Returns [] when nothing matches or the query has no topic words left
+        once the question words are removed. With match_all, also when any
+        topic word is not in the index (e.g. the query is someone's name).
+        """
+        terms = set(search_terms(query, QUERY_FILLER))
+        if match_all and not all(term in self.postings for term in terms):
+            return []
+        scores = {}
+        for term in terms:
+            for idx, weight in self.postings.get(term, ()):
+                scores[idx] = scores.get(idx, 0.0) + weight
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [TopicHit(self.courses[idx], score) for idx, score in best]
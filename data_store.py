@@ -0,0 +1,299 @@
+import gc
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+
+from professor_index import ProfessorIndex
+from availability import AvailabilityIndex
+from department_index import DepartmentIndex
+from suggest_index import SuggestIndex
+from records import Professor
+from course_catalog import CourseCatalog
+from course_search import CourseSearchIndex
+from spelling import SpellingCorrector, vocabulary
+from char_matrix import np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+SUBJECTS_PATH = os.path.join(PROJECT_ROOT, 'full_subjects_study_plan.json')
+OFFICE_HOURS_PATH = os.path.join(PROJECT_ROOT, 'office_hours.json')
+
+# Distinct field/page combinations of the listing endpoints kept per snapshot
+MAX_SERIALIZED_BODIES = 256
+
+# Built snapshots are pickled next to the data files under this name
+SNAPSHOT_CACHE_NAME = 'data_snapshot.pickle'
+# Modules defining what a pickled snapshot contains; editing one invalidates the cache
+SNAPSHOT_MODULES = ('data_store', 'records', 'text_utils', 'professor_index', 'course_catalog',
+                    'course_matcher', 'availability', 'department_index', 'suggest_index',
+                    'course_search', 'char_matrix', 'name_keys', 'spelling', 'intent_engine')
+_code_fingerprint = None
+
+
+def load_data(subjects_path=SUBJECTS_PATH, office_hours_path=OFFICE_HOURS_PATH):
+    """Loads data from JSON files with comprehensive error handling."""
+    try:
+        with open(subjects_path, 'r', encoding='utf-8') as f:
+            subjects_data = json.load(f)
+        print(f"✅ Successfully loaded subjects data from {subjects_path}")
+    except FileNotFoundError:
+        print(f"❌ Subjects file not found: {subjects_path}")
+        subjects_data = {}
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON decode error in subjects file: {e}")
+        subjects_data = {}
+    except PermissionError as e:
+        print(f"❌ Permission error accessing subjects file: {e}")
+        subjects_data = {}
+
+    try:
+        with open(office_hours_path, 'r', encoding='utf-8') as f:
+            office_hours_data = json.load(f)
+        print(f"✅ Successfully loaded office hours data from {office_hours_path}")
+    except FileNotFoundError:
+        print(f"❌ Office hours file not found: {office_hours_path}")
+        office_hours_data = []
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON decode error in office hours file: {e}")
+        office_hours_data = []
+    except PermissionError as e:
+        print(f"❌ Permission error accessing office hours file: {e}")
+        office_hours_data = []
+
+    return subjects_data, office_hours_data
+
+
+def _source_mtimes(paths):
+    """Returns {path: mtime} for the data files, None for missing ones."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _snapshot_cache_key(sources):
+    """Hashes the data files' bytes with the snapshot code and Python and NumPy versions."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha1(sys.version.encode())
+        # Snapshots built with NumPy hold arrays, ones built without it don't
+        digest.update((np.__version__ if np is not None else 'no numpy').encode())
+        for name in SNAPSHOT_MODULES:
+            with open(os.path.join(PROJECT_ROOT, name + '.py'), 'rb') as f:
+                digest.update(f.read())
+        _code_fingerprint = digest.hexdigest()
+    digest = hashlib.sha1(_code_fingerprint.encode())
+    for source in sources:
+        digest.update(len(source).to_bytes(8, 'little'))
+        digest.update(source)
+    return digest.hexdigest()
+
+
+class DataSnapshot:
+    """One consistent generation of the JSON data and every index derived from it.
+
+    The parsed JSON is converted to slotted records and then dropped; all
+    indexes reference those records. A snapshot is fully built before it is
+    published and never modified afterwards, so a request that holds one sees
+    the same data throughout.
+    """
+
+    def __init__(self, subjects_data, office_hours_data, version=1, source_mtimes=None):
+        self.version = version
+        self.loaded_at = time.time()
+        self.source_mtimes = source_mtimes or {}
+        self.professors = [Professor.from_json(prof) for prof in office_hours_data or []]
+        self.professor_index = ProfessorIndex(self.professors)
+        self.availability_index = AvailabilityIndex(self.professors)
+        self.department_index = DepartmentIndex(self.professors)
+        self.course_catalog = CourseCatalog(subjects_data)
+        self.suggest_index = SuggestIndex(self.professors, self.course_catalog.by_code.values())
+        self.course_search = CourseSearchIndex(self.course_catalog.by_code.values())
+        self.spelling = SpellingCorrector(vocabulary(self.professors, self.course_catalog.by_code.values()),
+                                          [prof.name for prof in self.professors])
+        self._serialized = {}
+
+    def serialized(self, key, build):
+        """Returns the SerializedBody cached under key, calling build() on a miss.
+
+        Bodies only depend on this snapshot's data, so they live and die with it.
+        """
+        body = self._serialized.get(key)
+        if body is None:
+            if len(self._serialized) >= MAX_SERIALIZED_BODIES:
+                self._serialized.clear()
+            body = self._serialized[key] = build()
+        return body
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_serialized'] = {}
+        return state
+
+
+class DataStore:
+    """Holds the current DataSnapshot and swaps in new ones when the files change.
+
+    Built snapshots are pickled to cache_path (by default next to the data
+    files) under a hash of the files' contents, so the next process to load
+    the same data unpickles the indexes instead of rebuilding them. The cache
+    is only read if it was written for identical data files and code.
+    """
+
+    def __init__(self, subjects_path=SUBJECTS_PATH, office_hours_path=OFFICE_HOURS_PATH,
+                 use_snapshot_cache=True, cache_path=None):
+        self.subjects_path = subjects_path
+        self.office_hours_path = office_hours_path
+        self.cache_path = None
+        if use_snapshot_cache:
+            self.cache_path = cache_path or os.path.join(os.path.dirname(office_hours_path), SNAPSHOT_CACHE_NAME)
+        self._lock = threading.Lock()
+        self._watcher_pid = None
+        self._failed_mtimes = None
+
+        mtimes = _source_mtimes(self.paths)
+        try:
+            snapshot = self._load_snapshot(1, mtimes)
+        except (OSError, ValueError):
+            # load_data() reports what is wrong and starts with empty data instead
+            snapshot = None
+        except Exception as e:
+            # Valid JSON of the wrong shape, e.g. a string among the professors
+            print(f"❌ Could not build data snapshot, starting with empty data: {e}")
+            snapshot = DataSnapshot({}, [], 1, mtimes)
+        if snapshot is None:
+            subjects_data, office_hours_data = load_data(subjects_path, office_hours_path)
+            try:
+                snapshot = DataSnapshot(subjects_data, office_hours_data, 1, mtimes)
+            except Exception as e:
+                print(f"❌ Could not build data snapshot, starting with empty data: {e}")
+                snapshot = DataSnapshot({}, [], 1, mtimes)
+        self._snapshot = snapshot
+
+    @property
+    def paths(self):
+        return (self.subjects_path, self.office_hours_path)
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def _load_snapshot(self, version, mtimes):
+        """Builds a snapshot from the data files, or unpickles it from the cache.
+
+        Raises OSError or ValueError (e.g. JSONDecodeError) if a file is
+        missing or does not parse, and whatever building the snapshot
+        raises for data of the wrong shape.
+        """
+        sources = []
+        for path in self.paths:
+            with open(path, 'rb') as f:
+                sources.append(f.read())
+        key = _snapshot_cache_key(sources) if self.cache_path else None
+
+        snapshot = self._read_cache(key)
+        if snapshot is not None:
+            snapshot.version = version
+            snapshot.loaded_at = time.time()
+            snapshot.source_mtimes = mtimes
+            print(f"✅ Loaded data snapshot from {self.cache_path}")
+            return snapshot
+
+        subjects_data, office_hours_data = (json.loads(source.decode('utf-8')) for source in sources)
+        snapshot = DataSnapshot(subjects_data, office_hours_data, version, mtimes)
+        print(f"✅ Built data snapshot from {self.subjects_path} and {self.office_hours_path}")
+        self._write_cache(key, snapshot)
+        return snapshot
+
+    def _read_cache(self, key):
+        if key is None:
+            return None
+        try:
+            with open(self.cache_path, 'rb') as f:
+                # The key is pickled first so a stale cache is rejected without loading it
+                if pickle.load(f) != key:
+                    return None
+                # Unpickling allocates every record and index at once; pausing the
+                # cyclic collector keeps it from rescanning them over and over
+                gc_was_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    return pickle.load(f)
+                finally:
+                    if gc_was_enabled:
+                        gc.enable()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable snapshot cache {self.cache_path}: {e}")
+            return None
+
+    def _write_cache(self, key, snapshot):
+        if key is None:
+            return
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic, so concurrently starting workers never read a partial file
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"⚠️ Could not write snapshot cache {self.cache_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def reload(self, force=False):
+        """Rebuilds the snapshot from disk and publishes it.
+
+        Returns True when a new snapshot was swapped in. If a file is missing,
+        does not parse (e.g. it is half-written) or holds data of the wrong
+        shape, the current snapshot is kept and the files are not tried
+        again until they change.
+        """
+        with self._lock:
+            current = self._snapshot
+            mtimes = _source_mtimes(self.paths)
+            if not force and mtimes in (current.source_mtimes, self._failed_mtimes):
+                return False
+            try:
+                snapshot = self._load_snapshot(current.version + 1, mtimes)
+            except Exception as e:
+                print(f"❌ Data reload failed, keeping version {current.version}: {e}")
+                self._failed_mtimes = mtimes
+                return False
+
+            self._snapshot = snapshot
+        print(f"✅ Reloaded data as version {snapshot.version}")
+        return True
+
+    def start_watcher(self, interval):
+        """Starts a daemon thread polling the data files every interval seconds.
+
+        Safe to call repeatedly; it starts one watcher per process, so it can
+        be called after a fork (e.g. from the first request in a gunicorn worker).
+        """
+        if interval <= 0 or self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"❌ Data watcher error: {e}")
+
+        threading.Thread(target=watch, name='data-watcher', daemon=True).start()
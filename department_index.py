@@ -0,0 +1,73 @@
+from text_utils import normalize_name, tokenize
+
+
+class Department:
+    """The professors of one department, in directory order."""
+
+    __slots__ = ('name', 'school', 'members', '_member_names')
+
+    def __init__(self, name, school):
+        self.name = name
+        self.school = school
+        self.members = []
+        self._member_names = []
+
+    def colleagues(self, exclude_name):
+        """Returns the members other than the one whose name matches exclude_name."""
+        excluded = normalize_name(exclude_name)
+        return [prof for prof, name in zip(self.members, self._member_names) if name != excluded]
+
+
+class DepartmentIndex:
+    """School -> department -> professors views over the directory, built once at load time.
+
+    Department and school names are looked up case- and whitespace-insensitively;
+    the first spelling seen in the directory is the one displayed.
+    """
+
+    def __init__(self, professors):
+        self.departments = {}
+        self.schools = {}
+        self._phrases = {}
+
+        for prof in professors:
+            if not prof.department:
+                continue
+            key = normalize_name(prof.department)
+            department = self.departments.get(key)
+            if department is None:
+                department = self.departments[key] = Department(prof.department, prof.school)
+                self._phrases[' '.join(tokenize(key))] = department
+                school_key = normalize_name(prof.school or '')
+                school = self.schools.setdefault(school_key, (prof.school or '', []))
+                school[1].append(department)
+            department.members.append(prof)
+            department._member_names.append(normalize_name(prof.name or ''))
+
+    def __len__(self):
+        return len(self.departments)
+
+    def get(self, department_name):
+        """Returns the Department for a name in any case or spacing, or None."""
+        return self.departments.get(normalize_name(department_name))
+
+    def find_in(self, text):
+        """Finds the department named (as whole words) in a message, preferring the longest name."""
+        text = f" {' '.join(tokenize(normalize_name(text)))} "
+        found = [phrase for phrase in self._phrases if f' {phrase} ' in text]
+        if not found:
+            return None
+        return self._phrases[max(found, key=len)]
+
+    def to_json(self):
+        """Schools with their departments and professor counts, in directory order."""
+        return [
+            {
+                'name': school_name,
+                'departments': [
+                    {'name': department.name, 'professors': len(department.members)}
+                    for department in departments
+                ]
+            }
+            for school_name, departments in self.schools.values()
+        ]
@@ -117,8 +117,9 @@ def test_flask_app():
         print_status("✅ Flask app imports successfully", "SUCCESS")
         
         # Test data loading
-        if hasattr(app, 'subjects_data') and hasattr(app, 'office_hours_data'):
-            print_status(f"✅ Data loaded: {len(app.subjects_data)} subjects, {len(app.office_hours_data)} professors", "SUCCESS")
+        if hasattr(app, 'data_store'):
+            snapshot = app.data_store.snapshot
+            print_status(f"✅ Data loaded: {len(snapshot.course_catalog.by_major)} subjects, {len(snapshot.professors)} professors", "SUCCESS")
         else:
             print_status("⚠️ Data not loaded properly", "WARNING")
         
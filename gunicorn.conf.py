@@ -0,0 +1,57 @@
+# Gunicorn settings for production. Every value can be overridden through the
+# environment, e.g. `GUNICORN_THREADS=16 gunicorn -c gunicorn.conf.py app:app`.
+#
+# The default `gthread` worker serves GUNICORN_THREADS requests at once per
+# process, sharing one copy of the data and indexes between its threads. Use
+# it instead of adding sync workers: each extra worker costs its own interpreter
+# and the pages of shared data it touches, each extra thread only a stack. `gevent` (pip install gevent) handles
+# many more concurrent connections per worker when clients are slow.
+#
+# With GUNICORN_PRELOAD (the default) the app, and so the data snapshot, is
+# loaded once in the master and the workers share those memory pages
+# copy-on-write instead of each building its own copy.
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Requests are CPU-bound and short, so a couple of processes per core is plenty;
+# concurrency comes from threads (gthread) or greenlets (gevent).
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap slow memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+if preload_app:
+    # Following the gc.freeze() recipe: no collections while the snapshot is
+    # built (they would leave freed holes between its objects), then freeze
+    # everything before forking so collections in the workers never write to
+    # the shared pages. Refcount updates still copy the pages a request reads.
+    gc.disable()
+
+
+def when_ready(server):
+    if preload_app:
+        gc.freeze()
+        gc.enable()
+        server.log.info("Froze %d preloaded objects for copy-on-write sharing", gc.get_freeze_count())
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # Anything the master allocated since the last fork
+        gc.freeze()
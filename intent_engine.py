@@ -0,0 +1,157 @@
+import re
+from typing import NamedTuple, Optional
+
+# Intent keywords, checked in priority order
+INTENT_KEYWORDS = {
+    'help': ['help', 'what can you do', 'assist', 'assistance'],
+    'course_search': ['course', 'subject', 'cs', 'it', 'se'],
+    'topic_search': ['cover', 'covered', 'class', 'classes', 'teaches', 'taught', 'learn', 'topic'],
+    'availability': ['available', 'availability', 'free', 'who has office hours', 'in office', 'in the office',
+                     'in their office', 'in his office', 'in her office',
+                     # Ahead of department_list's "who is in" at the same position
+                     'who is in office', 'who is in the office', 'who is in their office'],
+    'department_list': ['everyone in', 'everybody in', 'list everyone', 'professors in', 'staff in',
+                        'members of', 'who is in', 'who works in'],
+    'professor_search': ['professor', 'teacher', 'instructor', 'dr'],
+    'study_plan': ['plan', 'curriculum', 'year'],
+}
+
+# Follow-up questions about the current professor, checked in priority order
+FOLLOWUP_KEYWORDS = {
+    'school': ['school', 'college', 'faculty'],
+    'email': ['email', 'contact'],
+    'office': ['office', 'location', 'room'],
+    'schedule': ['schedule', 'hours', 'when', 'times'],
+}
+COLLEAGUE_KEYWORDS = {
+    'who_else': ['who else'],
+    'department': ['department'],
+}
+
+YEAR_WORDS = ['first', 'second', 'third', 'fourth', 'fifth', '1st', '2nd', '3rd', '4th', '5th']
+
+STUDY_PLAN_RE = re.compile(
+    r'(show|tell|give|what is|find)\s+(me\s+)?(the\s+)?(first|second|third|fourth|fifth|1st|2nd|3rd|4th|5th)'
+    r'\s+year\s+(plan\s+)?(for\s+)?([a-zA-Z\s]+)'
+)
+
+# Slots of availability questions ("who is free on Monday at 11?")
+DAY_RE = re.compile(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday|today|tomorrow)\b')
+CLOCK_RE = re.compile(r'\b(at\s+)?(\d{1,2})(?!\d)(?::([0-5]\d))?(?:\s*([ap])\.?m\b\.?)?')
+ANYONE_WORDS = {'who', 'whos', 'anyone', 'anybody', 'someone', 'somebody', 'which'}
+# Everything else left in an availability question is taken as a professor's name
+AVAILABILITY_FILLER = {
+    'when', 'is', 'are', 'will', 'be', 'can', 'i', 'we', 'see', 'meet', 'visit', 'find', 'me', 'there',
+    'dr', 'doctor', 'prof', 'professor', 'professors', 'teacher', 'instructor', 'mr', 'mrs', 'ms', 'eng',
+    'free', 'available', 'availability', 'next', 'now', 'right', 'currently', 'today', 'tomorrow',
+    'at', 'on', 'in', 'the', 'a', 'an', 'office', 'hours', 'has', 'have', 'what', 'time', 'this', 'week',
+    'he', 'she', 'they', 'him', 'her', 'them', 'his', 'their', 'do', 'does', 'of', 'for', 'any',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+} | ANYONE_WORDS
+
+
+def _alternation(words):
+    # Longest first so multi-word phrases win over their prefixes
+    return '|'.join(re.escape(word).replace(r'\ ', r'\s+') for word in sorted(words, key=len, reverse=True))
+
+
+def _build_scanner():
+    keyword_groups = []
+    for table in (INTENT_KEYWORDS, FOLLOWUP_KEYWORDS, COLLEAGUE_KEYWORDS):
+        for name, words in table.items():
+            keyword_groups.append(r'(?P<%s>%s)' % (name, _alternation(words)))
+    # Everything is anchored on one leading \b so mid-word positions fail fast.
+    # Keywords match whole words only, allowing a plural "s" ("courses", "emails").
+    # Course codes may have O or l typed for a digit ("CS2O1"), found by fuzzy lookup.
+    return re.compile(
+        r'\b(?:(?P<code>[a-z]{2,4}\s*(?:\d{3}|(?=[ol]{0,2}\d)[0-9ol]{3}\b))'
+        r'|(?P<year>%s)\s+year\b'
+        r'|(?:%s)s?\b)' % (_alternation(YEAR_WORDS), '|'.join(keyword_groups))
+    )
+
+
+SCANNER_RE = _build_scanner()
+
+
+class ParsedMessage(NamedTuple):
+    intent: str
+    course_code: Optional[str] = None
+    year: Optional[str] = None
+    major: Optional[str] = None
+    followup: Optional[str] = None
+    day: Optional[str] = None
+    clock: Optional[tuple] = None
+    name_query: Optional[str] = None
+    anyone: bool = False
+
+
+def parse_availability(message_lower):
+    """Extracts the slots of an availability question.
+
+    Returns (day, clock, name_query, anyone): day is a lowercase day name,
+    'today' or 'tomorrow'; clock is (hour, minute, 'a'/'p'/None); name_query
+    is what is left once the question words are removed; anyone is set for
+    "who ..." questions about the whole directory.
+    """
+    day_match = DAY_RE.search(message_lower)
+    day = day_match.group(1) if day_match else None
+
+    clock = None
+    rest = message_lower
+    for match in CLOCK_RE.finditer(message_lower):
+        at, hour, minute, meridiem = match.groups()
+        if at or minute or meridiem:
+            clock = (int(hour), int(minute or 0), meridiem)
+            rest = message_lower[:match.start()] + ' ' + message_lower[match.end():]
+            break
+
+    words = re.findall(r"[\w'-]+", rest.replace("'s", ''))
+    anyone = any(word in ANYONE_WORDS for word in words)
+    name_words = [word for word in words if word not in AVAILABILITY_FILLER]
+    name_query = ' '.join(name_words) or None
+    return day, clock, name_query, anyone
+
+
+def parse_message(user_message):
+    """Classifies a message and extracts its slots in a single regex scan.
+
+    followup is the professor field asked about ('colleagues', 'school',
+    'email', 'office' or 'schedule'), if any. year and major are only set
+    for study plan requests like "show me the first year plan for CS", and
+    the availability slots only for availability questions.
+    """
+    message_lower = user_message.lower().strip()
+
+    found = set()
+    course_code = None
+    year = None
+    for match in SCANNER_RE.finditer(message_lower):
+        group = match.lastgroup
+        if group == 'code':
+            if course_code is None:
+                course_code = match.group('code')
+        elif group == 'year':
+            year = year or match.group('year')
+            found.add('study_plan')
+        else:
+            found.add(group)
+
+    intent = next((name for name in INTENT_KEYWORDS if name in found), None)
+    if intent is None:
+        intent = 'course_search' if course_code else 'unknown'
+
+    if 'who_else' in found and 'department' in found:
+        followup = 'colleagues'
+    else:
+        followup = next((name for name in FOLLOWUP_KEYWORDS if name in found), None)
+
+    major = None
+    if year:
+        plan_match = STUDY_PLAN_RE.search(message_lower)
+        if plan_match:
+            year = plan_match.group(4)
+            major = plan_match.group(7)
+
+    if intent == 'availability':
+        return ParsedMessage(intent, course_code, year, major, followup, *parse_availability(message_lower))
+    return ParsedMessage(intent, course_code, year, major, followup)
@@ -0,0 +1,105 @@
+"""Spelling-independent keys for Arabic names written in Latin or Arabic script.
+
+One Arabic name has many Latin spellings: Mohammad, Muhammad and Mohammed;
+Alkhateeb and Al-Khatib; Hussein and Husayn. Every name token gets two
+keys that such variants share:
+
+- spelling_key() maps letters that stand for the same Arabic sound to one
+  symbol (kh, q/k, j/g, th/dh, doubled letters) and every run of vowels to
+  one of a, i or u, so "Mohammed" and "Muhammad" are both "muhamad".
+- sound_key() keeps only the consonants, "mhmd". Arabic script leaves out
+  short vowels, so this is also the key of an Arabic-script name, and the
+  one that matches spellings whose vowels differ (Yousef, Yusuf).
+
+The article and "abd"/"abu" are joined to the word after them, so
+"Abd Al-Rahman" and "Abdulrahman" are one token.
+"""
+import re
+from functools import lru_cache
+
+from text_utils import normalize_name
+
+# Tokens that belong to the word after them
+PREFIX_TOKENS = {'al', 'el', 'abd', 'abdel', 'abdul', 'abdal', 'abu', 'abo', 'bin', 'ibn',
+                 'ال', 'عبد', 'ابو', 'بن'}
+
+_LATIN_DIGRAPHS = (('kh', 'X'), ('sh', 'S'), ('ch', 'S'), ('gh', 'G'), ('th', 'T'), ('dh', 'T'),
+                   ('ph', 'f'), ('ck', 'k'))
+_LATIN_LETTERS = str.maketrans({'c': 'k', 'q': 'k', 'g': 'j', 'p': 'b', 'v': 'f', 'x': 'X'})
+
+# Hamza is dropped and its carriers folded before normalize_name() strips it
+_ARABIC_HAMZA = str.maketrans({'ء': '', 'ؤ': '', 'ئ': '', 'أ': 'ا', 'إ': 'ا', 'آ': 'ا'})
+# Arabic letters as the symbols above; alif, waw and ya are long vowels
+# except where _ARABIC_CONSONANT_WY_RE finds waw and ya used as consonants
+_ARABIC_LETTERS = str.maketrans({
+    'ا': 'a', 'ى': 'a', 'ع': '', 'ـ': '', 'ة': '',
+    'ب': 'b', 'ت': 't', 'ث': 'T', 'ج': 'j', 'ح': 'h', 'خ': 'X', 'د': 'd', 'ذ': 'T', 'ر': 'r',
+    'ز': 'z', 'س': 's', 'ش': 'S', 'ص': 's', 'ض': 'd', 'ط': 't', 'ظ': 'z', 'غ': 'G', 'ف': 'f',
+    'ق': 'k', 'ك': 'k', 'ل': 'l', 'م': 'm', 'ن': 'n', 'ه': 'h', 'و': 'u', 'ي': 'i',
+})
+_ARABIC_RE = re.compile('[؀-ۿ]')
+
+# w and y as consonants are W and Y; as vowels they are part of a vowel run
+_LATIN_CONSONANT_WY_RE = re.compile(r'^[wy]|[wy](?=[aeiou])')
+_ARABIC_CONSONANT_WY_RE = re.compile('^[وي]|(?<=ا)[وي]|[وي](?=[اوي])')
+_VOWEL_RUN_RE = re.compile(r'[aeiouwy]+')
+_DOUBLE_CONSONANT_RE = re.compile(r'([^aeiouwy])\1+')
+
+
+def is_arabic(text):
+    return bool(_ARABIC_RE.search(text))
+
+
+def name_tokens(name):
+    """Splits a name into lowercase tokens, joining prefixes to the token after them."""
+    tokens = []
+    pending = ''
+    text = normalize_name(name.translate(_ARABIC_HAMZA)).replace("'", '')
+    for token in re.findall(r'\w+', text):
+        if token in PREFIX_TOKENS:
+            pending += token
+        else:
+            tokens.append(pending + token)
+            pending = ''
+    if pending:
+        tokens.append(pending)
+    return tokens
+
+
+def _symbols(token):
+    if is_arabic(token):
+        token = _ARABIC_CONSONANT_WY_RE.sub(lambda match: 'W' if match.group() == 'و' else 'Y', token)
+        token = token.translate(_ARABIC_LETTERS)
+    else:
+        for digraph, symbol in _LATIN_DIGRAPHS:
+            token = token.replace(digraph, symbol)
+        token = token.translate(_LATIN_LETTERS)
+        token = _LATIN_CONSONANT_WY_RE.sub(lambda match: match.group().upper(), token)
+        # A final h after a vowel is silent: Fatimah, Rahmeh
+        if len(token) > 2 and token.endswith('h') and token[-2] in 'aeiouwy':
+            token = token[:-1]
+    return _DOUBLE_CONSONANT_RE.sub(r'\1', token)
+
+
+def _vowel_class(run):
+    if any(char in run for char in 'ouw'):
+        return 'u'
+    if any(char in run for char in 'iy') or 'ee' in run:
+        return 'i'
+    return 'a'
+
+
+@lru_cache(maxsize=65536)
+def spelling_key(token):
+    """Returns the token with variant spellings of each sound and vowel run folded together."""
+    return _VOWEL_RUN_RE.sub(lambda match: _vowel_class(match.group()), _symbols(token))
+
+
+@lru_cache(maxsize=65536)
+def sound_key(token):
+    """Returns the token's consonants, folded as in spelling_key()."""
+    consonants = _VOWEL_RUN_RE.sub('', _symbols(token))
+    # Latin spellings drop a final h that Arabic writes (Falah, Saleh, Abdullah)
+    if len(consonants) > 1 and consonants.endswith('h'):
+        consonants = consonants[:-1]
+    return consonants
@@ -0,0 +1,277 @@
+from bisect import insort
+from collections import defaultdict
+from itertools import chain
+from typing import NamedTuple
+
+from char_matrix import CharMatrix, np
+from name_keys import is_arabic, name_tokens, sound_key, spelling_key
+from records import Professor
+from text_utils import SimilarityScorer, calculate_similarity, normalize_name, tokenize, char_ngrams
+
+FUZZY_THRESHOLD = 0.6
+TITLE_TOKENS = {'dr', 'prof', 'professor', 'mr', 'mrs', 'ms', 'eng'}
+# Fewest consonants a sound_key() lookup needs, so "Reem" doesn't find "Rami"
+MIN_SOUND_KEY = 3
+# Order of search() results by how they matched; within a tier, by score
+MATCH_TIERS = {'contains': 0, 'phonetic': 1, 'fuzzy': 2, 'sound': 3}
+
+
+def _name_keys(tokens):
+    """Builds the surname and initials keys for a list of name tokens."""
+    tokens = [t for t in tokens if t not in TITLE_TOKENS]
+    if not tokens:
+        return None, None
+    surname = tokens[-1]
+    initials = ' '.join([t[0] for t in tokens[:-1]] + [surname])
+    return surname, initials
+
+
+def _variant_keys(tokens, key):
+    """Returns key() of each name_tokens() token and the keys joined, however the name is split."""
+    keys = [k for k in map(key, tokens) if k]
+    return keys, ''.join(keys)
+
+
+def _variant_tokens(name):
+    return [token for token in name_tokens(name) if token not in TITLE_TOKENS]
+
+
+class ProfessorMatch(NamedTuple):
+    """A search hit: a reference to the directory record plus how it matched."""
+    record: Professor
+    match_type: str
+    similarity: float
+
+    @property
+    def name(self):
+        return self.record.name or ''
+
+    def to_dict(self):
+        """Materializes a JSON-ready copy of the record with the match fields."""
+        result = self.record.to_json()
+        result['match_type'] = self.match_type
+        result['similarity'] = self.similarity
+        return result
+
+
+class ProfessorIndex:
+    """Name index over the office hours directory, built once at load time.
+
+    Every record's name is normalized up front and posted under its word
+    tokens, character trigrams, surname and initials key. A lookup scores
+    the records that share something with the query first, so the cheap
+    upper bounds rule out most of the rest of the directory without
+    scoring it (a name can resemble the query without sharing a trigram,
+    so the rest is never skipped outright). Spelling variants of Arabic names (Mohammed, Muhammad,
+    محمد) share keys from name_keys, posted under every token and the whole
+    name, and are found by lookup alongside the fuzzy scoring. With NumPy installed the names are also embedded in a
+    CharMatrix, which bounds every candidate's similarity in one product so
+    only the candidates that can still make the results are scored.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.names = []
+        self._exact = {}
+        self._by_token = defaultdict(list)
+        self._by_trigram = defaultdict(list)
+        self._by_surname = defaultdict(list)
+        self._by_initials = defaultdict(list)
+        self._by_spelling = defaultdict(list)
+        self._by_sound = defaultdict(list)
+
+        for idx, prof in enumerate(records):
+            name = normalize_name(prof.name or '')
+            self.names.append(name)
+            if not name:
+                continue
+            self._exact.setdefault(name, idx)
+            tokens = tokenize(name)
+            for token in set(tokens):
+                self._by_token[token].append(idx)
+            for gram in char_ngrams(name):
+                self._by_trigram[gram].append(idx)
+            surname, initials = _name_keys(tokens)
+            if surname:
+                self._by_surname[surname].append(idx)
+                self._by_initials[initials].append(idx)
+            variant_tokens = _variant_tokens(prof.name)
+            for key, index in ((spelling_key, self._by_spelling), (sound_key, self._by_sound)):
+                keys, joined = _variant_keys(variant_tokens, key)
+                for variant in set(keys) | {joined}:
+                    if variant:
+                        index[variant].append(idx)
+
+        self._named = [idx for idx, name in enumerate(self.names) if name]
+        self._matrix = CharMatrix(self.names) if CharMatrix.available else None
+
+    def __len__(self):
+        return len(self.records)
+
+    def _candidates(self, clean_input):
+        """Returns the ids of records sharing a token, trigram or key with the query.
+
+        These are the likely matches, not all of them.
+        """
+        if len(clean_input) < 3:
+            # Too short to have trigrams; the length bound in search() does the pruning.
+            return list(self._named)
+
+        candidates = set()
+        for gram in char_ngrams(clean_input):
+            candidates.update(self._by_trigram.get(gram, ()))
+        tokens = tokenize(clean_input)
+        for token in tokens:
+            candidates.update(self._by_token.get(token, ()))
+        surname, initials = _name_keys(tokens)
+        if surname:
+            candidates.update(self._by_surname.get(surname, ()))
+            candidates.update(self._by_initials.get(initials, ()))
+        return sorted(candidates)
+
+    def _spelling_variants(self, professor_name, use_sound=True):
+        """Finds the names that are the query spelled differently, by key lookup.
+
+        Every query token must match a token of the name, or the joined
+        query the joined name, by spelling_key() or failing that (and only
+        with use_sound) by sound_key(); Arabic-script queries only have the
+        latter. Returns (-score, idx, match_type) tuples scored by how alike
+        the keys are, as 'phonetic' matches or, when only the sound keys
+        matched, 'sound' matches that are only a guess.
+        """
+        levels = [(sound_key, self._by_sound)] if use_sound else []
+        if not is_arabic(professor_name):
+            levels.insert(0, (spelling_key, self._by_spelling))
+        query_tokens = _variant_tokens(professor_name)
+        for key, index in levels:
+            keys, joined = _variant_keys(query_tokens, key)
+            if not keys or (key is sound_key and len(joined) < MIN_SOUND_KEY):
+                continue
+            found = index.get(joined)
+            if not found:
+                found = set(index.get(keys[0], ()))
+                for variant in keys[1:]:
+                    found.intersection_update(index.get(variant, ()))
+            if found:
+                break
+        else:
+            return []
+
+        query_keys = ' '.join(keys)
+        variant_type = 'sound' if key is sound_key else 'phonetic'
+        ranked = []
+        for idx in set(found):
+            name_keys = ' '.join(_variant_keys(_variant_tokens(self.records[idx].name), key)[0])
+            ranked.append((-calculate_similarity(query_keys, name_keys), idx, variant_type))
+        return ranked
+
+    def search(self, professor_name, limit=None, overlaps=None):
+        """Returns ProfessorMatch results, best match first.
+
+        Names containing the query come first, then spelling variants found
+        by key lookup, then fuzzy matches, then names that only sound alike,
+        which are looked up only when nothing else matched. With a limit
+        only the best limit matches are returned. overlaps is this query's
+        row from overlaps_many(), for queries scored in bulk.
+        """
+        clean_input = normalize_name(professor_name)
+
+        exact_idx = self._exact.get(clean_input)
+        if exact_idx is not None:
+            return [ProfessorMatch(self.records[exact_idx], 'exact', 1.0)]
+
+        literal = self._literal_matches(clean_input, limit, overlaps)
+        best = {}
+        for score, idx, match_type in literal + self._spelling_variants(professor_name, use_sound=not literal):
+            entry = (MATCH_TIERS[match_type], score, idx, match_type)
+            if idx not in best or entry < best[idx]:
+                best[idx] = entry
+        ranked = sorted(best.values())
+        if limit:
+            ranked = ranked[:limit]
+        return [ProfessorMatch(self.records[idx], match_type, -score) for _, score, idx, match_type in ranked]
+
+    def _literal_matches(self, clean_input, limit=None, overlaps=None):
+        """Returns (-similarity, idx, match_type) for the names containing or resembling the query.
+
+        These are the names calculate_similarity() rates above
+        FUZZY_THRESHOLD or that contain the query, best first, as scanning
+        the whole directory would find them.
+        """
+        if self._matrix is not None:
+            return self._search_bounded(clean_input, self._named, limit, overlaps)
+
+        # The likely matches go first so that, with a limit, the floor rises
+        # before the rest of the directory is bounded against it
+        likely = self._candidates(clean_input)
+        seen = set(likely)
+        scorer = SimilarityScorer(clean_input)
+        ranked = []
+        for idx in chain(likely, (idx for idx in self._named if idx not in seen)):
+            name = self.names[idx]
+            contains = clean_input in name
+            # Only ratios that can still make the results are computed in full;
+            # a name tying the worst is still scored, and insort() ranks it by id
+            worst = -ranked[-1][0] if limit and len(ranked) >= limit else None
+            if contains:
+                floor = worst
+            else:
+                floor = FUZZY_THRESHOLD if worst is None else max(FUZZY_THRESHOLD, worst)
+            similarity = scorer.score(name, floor)
+            if similarity is not None and (contains or similarity > FUZZY_THRESHOLD):
+                insort(ranked, (-similarity, idx, 'contains' if contains else 'fuzzy'))
+                if limit:
+                    del ranked[limit:]
+        return ranked
+
+    def _search_bounded(self, clean_input, candidates, limit, overlaps):
+        """_literal_matches() over the candidates in order of their CharMatrix similarity bound.
+
+        Names sharing fewer characters than the query has can neither
+        contain it nor score above the threshold, so they are never scored,
+        and once limit matches are found scoring stops at the first bound
+        below the worst of them. Ties go to directory order, as without NumPy.
+        """
+        if not candidates:
+            return []
+        if overlaps is None:
+            overlaps = self._matrix.overlaps(clean_input)
+        candidates = np.asarray(candidates)
+        bounds = self._matrix.bounds(clean_input, overlaps, candidates)
+        possible = (bounds > FUZZY_THRESHOLD) | (overlaps[candidates] >= len(clean_input))
+        candidates, bounds = candidates[possible], bounds[possible]
+
+        scorer = SimilarityScorer(clean_input)
+        ranked = []
+        for i in np.lexsort((candidates, -bounds)):
+            if limit and len(ranked) >= limit and bounds[i] < -ranked[limit - 1][0]:
+                break
+            idx = int(candidates[i])
+            name = self.names[idx]
+            contains = clean_input in name
+            # The matrix bound is quick_ratio()'s, so go straight to the full ratio
+            similarity = scorer.score(name)
+            if contains or similarity > FUZZY_THRESHOLD:
+                insort(ranked, (-similarity, idx, 'contains' if contains else 'fuzzy'))
+        if limit:
+            ranked = ranked[:limit]
+        return ranked
+
+    def overlaps_many(self, names):
+        """Scores many queries against the directory in bulk for search(overlaps=...).
+
+        Returns {query: overlaps}, or {} without NumPy. Queries answered by
+        an exact match are skipped.
+        """
+        if self._matrix is None:
+            return {}
+        queries = {}
+        for name in names:
+            clean_input = normalize_name(name)
+            if clean_input and clean_input not in self._exact:
+                queries.setdefault(clean_input, []).append(name)
+        bulk = {}
+        for clean_input, overlaps in self._matrix.overlaps_many(queries):
+            for name in queries[clean_input]:
+                bulk[name] = overlaps
+        return bulk
@@ -0,0 +1,149 @@
+"""Compact record types for the office hours directory and the course catalog.
+
+The JSON files are loaded into these instead of being kept as nested dicts:
+every record uses __slots__, and values that repeat across records (school,
+department, major, level, day names, common time ranges) are interned so
+each distinct string is stored once per worker.
+"""
+import sys
+from collections.abc import Mapping
+
+from availability import parse_time_ranges
+
+DAYS_ORDER = ("Saturday", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class OfficeHours(Mapping):
+    """Read-only day -> schedule text mapping stored as a tuple of pairs.
+
+    The text is also parsed once into (start, end) minute intervals per day.
+    """
+
+    __slots__ = ('_days', '_intervals')
+
+    def __init__(self, days=()):
+        self._days = tuple((_intern(day), _intern(text)) for day, text in days)
+        self._intervals = tuple((day, parse_time_ranges(text)) for day, text in self._days)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.items() if isinstance(data, dict) else ())
+
+    def __getitem__(self, day):
+        for key, text in self._days:
+            if key == day:
+                return text
+        raise KeyError(day)
+
+    def __iter__(self):
+        return (day for day, _ in self._days)
+
+    def __len__(self):
+        return len(self._days)
+
+    def __repr__(self):
+        return f"OfficeHours({dict(self._days)!r})"
+
+    def __getstate__(self):
+        return self._days, self._intervals
+
+    def __setstate__(self, state):
+        self._days, self._intervals = state
+
+    def intervals(self, day):
+        """Returns the sorted (start, end) minute intervals for day."""
+        for key, intervals in self._intervals:
+            if key == day:
+                return intervals
+        return ()
+
+    def to_json(self):
+        return dict(self._days)
+
+
+class Professor:
+    """One office hours directory entry."""
+
+    __slots__ = ('name', 'school', 'department', 'email', 'office', 'office_hours', 'extra')
+
+    FIELDS = ('name', 'school', 'department', 'email', 'office', 'office_hours')
+
+    def __init__(self, name=None, school=None, department=None, email=None, office=None,
+                 office_hours=None, extra=None):
+        self.name = name
+        self.school = _intern(school)
+        self.department = _intern(department)
+        self.email = email
+        self.office = office
+        self.office_hours = office_hours if office_hours is not None else OfficeHours()
+        # Any keys beyond the known fields, kept so to_json() round-trips the source
+        self.extra = extra or None
+
+    @classmethod
+    def from_json(cls, data):
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(
+            name=data.get('name'),
+            school=data.get('school'),
+            department=data.get('department'),
+            email=data.get('email'),
+            office=data.get('office'),
+            office_hours=OfficeHours.from_json(data.get('office_hours', {})),
+            extra=extra
+        )
+
+    def __repr__(self):
+        return f"Professor({self.name!r})"
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def to_json(self):
+        data = {}
+        for field in self.FIELDS[:-1]:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        data['office_hours'] = self.office_hours.to_json()
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class Course:
+    """One course in one major's study plan."""
+
+    __slots__ = ('code', 'major', 'level', 'name', 'description', 'credits')
+
+    def __init__(self, code, major, level, name='', description='', credits=''):
+        self.code = code
+        self.major = _intern(major)
+        self.level = _intern(level)
+        self.name = name
+        self.description = description
+        self.credits = credits
+
+    @classmethod
+    def from_json(cls, code, major, level, data):
+        return cls(code, major, level, data.get('name', ''), data.get('description', ''), data.get('credits', ''))
+
+    def __repr__(self):
+        return f"Course({self.code!r}, {self.major!r}, {self.level!r})"
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def to_json(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
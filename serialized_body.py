@@ -0,0 +1,28 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+
+
+class SerializedBody:
+    """A JSON payload serialized and gzip-compressed once, with its cache validators.
+
+    The ETag is a hash of the body, so every worker serving the same data
+    hands out the same validators and browsers can revalidate against any of them.
+    """
+
+    def __init__(self, payload, last_modified=None):
+        self.body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        # mtime=0 keeps the compressed bytes identical across workers and restarts
+        self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        digest = hashlib.sha1(self.body).hexdigest()
+        self.etag = digest
+        self.gzip_etag = digest + '-gz'
+        self.last_modified = last_modified
+
+    @classmethod
+    def from_mtime_ns(cls, payload, mtime_ns):
+        last_modified = None
+        if mtime_ns is not None:
+            last_modified = datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc).replace(microsecond=0)
+        return cls(payload, last_modified)
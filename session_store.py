@@ -0,0 +1,109 @@
+import json
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+class ConversationContext:
+    def __init__(self):
+        self.last_query_type: Optional[str] = None
+        self.last_subject: Optional[str] = None
+        self.last_professor: Optional[dict] = None
+        self.query_count: int = 0
+        self.preferences: dict = {}
+
+    def to_dict(self):
+        return {
+            'last_query_type': self.last_query_type,
+            'last_subject': self.last_subject,
+            'last_professor': self.last_professor,
+            'query_count': self.query_count,
+            'preferences': self.preferences,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        context = cls()
+        for key, value in data.items():
+            if hasattr(context, key):
+                setattr(context, key, value)
+        return context
+
+
+def new_session_id():
+    return secrets.token_urlsafe(16)
+
+
+def valid_session_id(session_id):
+    return isinstance(session_id, str) and bool(SESSION_ID_RE.match(session_id))
+
+
+class SessionStore:
+    """In-process LRU of ConversationContexts keyed by session id, with TTL expiry."""
+
+    def __init__(self, max_sessions=10000, ttl=1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get_or_create(self, session_id=None):
+        """Returns (session_id, context), starting a new session if the id is unknown or invalid."""
+        if not valid_session_id(session_id):
+            session_id = new_session_id()
+        now = time.monotonic()
+        with self._lock:
+            item = self._sessions.get(session_id)
+            if item is not None and now - item[0] < self.ttl:
+                self._sessions.move_to_end(session_id)
+                return session_id, item[1]
+        return session_id, ConversationContext()
+
+    def save(self, session_id, context):
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = (now, context)
+            self._sessions.move_to_end(session_id)
+            # Oldest entries are at the front: drop the expired ones and anything over capacity
+            while self._sessions:
+                oldest_id, (saved_at, _) = next(iter(self._sessions.items()))
+                if len(self._sessions) <= self.max_sessions and now - saved_at < self.ttl:
+                    break
+                del self._sessions[oldest_id]
+
+
+class RedisSessionStore:
+    """Session store backed by a Redis-compatible client (anything with get/set(ex=))."""
+
+    key_prefix = 'htu:session:'
+
+    def __init__(self, client, ttl=1800):
+        self.client = client
+        self.ttl = ttl
+
+    def get_or_create(self, session_id=None):
+        if not valid_session_id(session_id):
+            session_id = new_session_id()
+        raw = self.client.get(self.key_prefix + session_id)
+        if raw is None:
+            return session_id, ConversationContext()
+        return session_id, ConversationContext.from_dict(json.loads(raw))
+
+    def save(self, session_id, context):
+        self.client.set(self.key_prefix + session_id, json.dumps(context.to_dict()), ex=int(self.ttl))
+
+
+def create_session_store(redis_url=None, max_sessions=10000, ttl=1800):
+    """Returns a RedisSessionStore when a URL is given, else the in-process store."""
+    if redis_url:
+        import redis  # optional dependency, only needed for a shared store
+        return RedisSessionStore(redis.Redis.from_url(redis_url), ttl)
+    return SessionStore(max_sessions, ttl)
@@ -0,0 +1,173 @@
+"""Spelling correction for chat messages, SymSpell style.
+
+Every vocabulary word is stored under each string left by deleting up to
+MAX_EDIT_DISTANCE of its letters. A misspelled token's own deletes then
+find every word within that many edits with a few dictionary lookups,
+whatever the size of the vocabulary, and the candidates are confirmed
+with an edit distance that counts swapped neighbours as one edit.
+
+Names are never corrected: the vocabulary has no professor names, and a
+token that is part of a directory name, or another spelling of one, is
+left for the name keys of the professor search.
+"""
+import re
+from collections import Counter
+from itertools import combinations
+
+from course_search import QUERY_FILLER, stem
+from intent_engine import (AVAILABILITY_FILLER, COLLEAGUE_KEYWORDS, FOLLOWUP_KEYWORDS, INTENT_KEYWORDS,
+                           YEAR_WORDS)
+from name_keys import name_tokens, spelling_key
+from text_utils import normalize_name
+
+MAX_EDIT_DISTANCE = 2
+# Shorter tokens are left alone, as are tokens with digits (course codes);
+# most four-letter names are one edit away from some word ("Dana", "data")
+MIN_WORD_LENGTH = 5
+# Tokens shorter than this are corrected by at most one edit
+LONG_WORD_LENGTH = 8
+
+# Everyday chat words, so they are not "corrected" into a nearby course word
+COMMON_WORDS = {
+    'hello', 'hey', 'thanks', 'thank', 'please', 'okay', 'good', 'morning', 'evening', 'name', 'know',
+    'like', 'could', 'would', 'should', 'where', 'here', 'with', 'from', 'info', 'information',
+    'details', 'about', 'give', 'list', 'show', 'tell', 'plan', 'more', 'other', 'also', 'your',
+    'need', 'want', 'they', 'them', 'than', 'then', 'when', 'what', 'which', 'there', 'their',
+    'same', 'some', 'reach', 'call', 'meet', 'late', 'early', 'night', 'right', 'left', 'back', 'sorry',
+    'today', 'tomorrow', 'week', 'free', 'busy', 'open', 'closed', 'room', 'phone', 'number', 'nice',
+    'great', 'cool', 'mean', 'exam', 'grade', 'mark', 'student', 'teacher', 'doctor', 'dean', 'head',
+}
+
+_WORD_RE = re.compile(r'[A-Za-z]+')
+
+
+def _words(text):
+    return [word for word in re.findall(r'[a-z]+', normalize_name(text or '')) if len(word) > 1]
+
+
+def vocabulary(professors, courses):
+    """Counts the words typos are corrected into: departments, the catalog and the intent keywords."""
+    counts = Counter()
+    for prof in professors:
+        counts.update(_words(prof.department))
+        counts.update(_words(prof.school))
+    for course in courses:
+        counts.update(_words(course.name))
+        counts.update(_words(course.description))
+        counts.update(_words(course.major))
+        counts.update(_words(course.level))
+    for table in (INTENT_KEYWORDS, FOLLOWUP_KEYWORDS, COLLEAGUE_KEYWORDS):
+        for phrases in table.values():
+            for phrase in phrases:
+                counts.update(_words(phrase))
+    for words in (YEAR_WORDS, AVAILABILITY_FILLER, QUERY_FILLER, COMMON_WORDS):
+        counts.update(word for word in words if word.isalpha())
+    return counts
+
+
+def edit_distance(a, b, limit):
+    """Returns the edit distance between a and b counting an adjacent swap as one edit.
+
+    Stops early and returns limit + 1 once the distance must exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    two_back = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, two_back[j - 2] + 1)
+            current[j] = value
+        # A swap reaches back two rows, so both must be over the limit
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        two_back, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletes(word, distance):
+    """Returns every string left by deleting up to distance letters of word, word included."""
+    found = {word}
+    for count in range(1, min(distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), count):
+            found.add(''.join(char for i, char in enumerate(word) if i not in positions))
+    return found
+
+
+class SpellingCorrector:
+    """Symmetric-delete spelling dictionary over a word -> count vocabulary.
+
+    names are the directory's names, whose words are never corrected.
+    """
+
+    def __init__(self, counts, names=(), max_distance=MAX_EDIT_DISTANCE):
+        self.counts = dict(counts)
+        self.max_distance = max_distance
+        # Another form of a known word ("teaching", "schedules") is not a misspelling
+        self._stems = {stem(word) for word in self.counts}
+        tokens = {token for name in names for token in name_tokens(name)}
+        # One string, so a substring test covers every name token ("bata" in "bataineh")
+        self._name_text = ' '.join(sorted(tokens))
+        self._name_keys = {spelling_key(token) for token in tokens}
+        self._by_delete = {}
+        for word in self.counts:
+            for variant in _deletes(word, max_distance):
+                self._by_delete.setdefault(variant, []).append(word)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def is_name(self, token):
+        """Returns whether a lowercase token is part of a directory name or spelled like one."""
+        return token in self._name_text or spelling_key(token) in self._name_keys
+
+    def correct_word(self, token):
+        """Returns the closest vocabulary word to a lowercase token, or the token itself.
+
+        Ties go to the more common word, then the alphabetically first.
+        """
+        if token in self.counts or len(token) < MIN_WORD_LENGTH or stem(token) in self._stems:
+            return token
+        if self.is_name(token):
+            return token
+        limit = min(1 if len(token) < LONG_WORD_LENGTH else 2, self.max_distance)
+        best = None
+        seen = set()
+        for variant in _deletes(token, limit):
+            for word in self._by_delete.get(variant, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                distance = edit_distance(token, word, limit)
+                if distance <= limit:
+                    candidate = (distance, -self.counts[word], word)
+                    if best is None or candidate < best:
+                        best = candidate
+        return best[2] if best else token
+
+    def correct(self, message):
+        """Corrects every unknown word of a message.
+
+        Returns (text, corrections): the message with corrected words in
+        lowercase, and the (word, correction) pairs. Tokens with digits
+        or non-ASCII letters are never touched.
+        """
+        corrections = []
+
+        def replace(match):
+            start, end = match.span()
+            # Part of a course code like "cs201" or a longer non-ASCII word
+            if (start and message[start - 1].isalnum()) or (end < len(message) and message[end].isalnum()):
+                return match.group()
+            word = match.group().lower()
+            fixed = self.correct_word(word)
+            if fixed == word:
+                return match.group()
+            corrections.append((match.group(), fixed))
+            return fixed
+
+        text = _WORD_RE.sub(replace, message)
+        return text, corrections
@@ -0,0 +1,114 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+
+from text_utils import normalize_name, tokenize
+
+# Most suggestions one query can ask for
+MAX_SUGGESTIONS = 20
+# Prefixes matching more keys than this get their top suggestions precomputed
+HEAVY_PREFIX = 64
+
+_WORD_START_RE = re.compile(r'\b\w')
+
+
+def suggest_key(text):
+    """Lowercases, strips accents and punctuation, and single-spaces a name or query."""
+    return ' '.join(tokenize(normalize_name(text)))
+
+
+class Suggestion:
+    __slots__ = ('text', 'type', 'details')
+
+    def __init__(self, text, type, details):
+        self.text = text
+        self.type = type
+        self.details = details
+
+    def to_json(self):
+        return {'text': self.text, 'type': self.type, 'details': self.details}
+
+
+class SuggestIndex:
+    """Prefix index for autocomplete over professor names, course codes and course titles.
+
+    This is a trie flattened into a sorted key array: every word-start
+    suffix of a name or title is a key, and a prefix query is the bisect
+    range of keys starting with it. The top suggestions for prefixes with
+    large ranges (the trie's busy upper nodes) are ranked at load time, so
+    no query ranks more than HEAVY_PREFIX keys.
+
+    Matches at the start of a name or code rank before matches on a later
+    word or in a course title; ties go to the shorter text, then directory order.
+    """
+
+    def __init__(self, professors, courses):
+        self.suggestions = []
+        entries = []
+
+        for prof in professors:
+            if not prof.name:
+                continue
+            details = ' • '.join(part for part in (prof.department, prof.school) if part)
+            self._add(entries, Suggestion(prof.name, 'professor', details), prof.name, ())
+        for course in courses:
+            details = f"{course.name} • {course.credits} credits"
+            self._add(entries, Suggestion(course.code, 'course', details), course.code, (course.name,))
+
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._ranks = array('q', [rank for _, rank, _ in entries])
+        self._ids = array('q', [idx for _, _, idx in entries])
+        self._heavy = {}
+        self._index_heavy(0, len(entries), 1)
+
+    def _add(self, entries, suggestion, primary, secondary):
+        idx = len(self.suggestions)
+        self.suggestions.append(suggestion)
+        for position, text in enumerate((primary,) + secondary):
+            key = suggest_key(text)
+            for match in _WORD_START_RE.finditer(key):
+                starts_primary = position == 0 and match.start() == 0
+                # (later-word match, text length, directory order) packed into one int
+                rank = (0 if starts_primary else 1) << 48 | min(len(suggestion.text), 0xFFFF) << 32 | idx
+                entries.append((key[match.start():], rank, idx))
+
+    def _index_heavy(self, lo, hi, depth):
+        """Precomputes the top suggestions of every prefix of length depth in keys[lo:hi] with a big range."""
+        start = lo
+        while start < hi:
+            if len(self._keys[start]) < depth:
+                # Shorter keys sort first and have no prefix of this length
+                start += 1
+                continue
+            prefix = self._keys[start][:depth]
+            end = bisect_left(self._keys, prefix + '\uffff', start, hi)
+            if end - start > HEAVY_PREFIX:
+                self._heavy[prefix] = self._rank(start, end, MAX_SUGGESTIONS)
+                self._index_heavy(start, end, depth + 1)
+            start = end
+
+    def _rank(self, lo, hi, limit):
+        """Returns the ids of the best limit distinct suggestions among keys[lo:hi]."""
+        # A suggestion has a key per word, so over-fetch before dropping repeats
+        fetch = limit * 2
+        while True:
+            best = heapq.nsmallest(fetch, range(lo, hi), key=self._ranks.__getitem__)
+            ids = list(dict.fromkeys(self._ids[i] for i in best))
+            if len(ids) >= limit or len(best) == hi - lo:
+                return tuple(ids[:limit])
+            fetch *= 4
+
+    def suggest(self, query, limit=5):
+        """Returns up to limit Suggestions whose name, code or title has a word starting with query."""
+        prefix = suggest_key(query)
+        if not prefix:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        ids = self._heavy.get(prefix)
+        if ids is None:
+            lo = bisect_left(self._keys, prefix)
+            hi = bisect_left(self._keys, prefix + '\uffff', lo)
+            ids = self._rank(lo, hi, limit)
+        return [self.suggestions[idx] for idx in ids[:limit]]
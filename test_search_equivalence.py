@@ -0,0 +1,144 @@
+"""Checks the indexed lookups against a brute-force scan of the whole directory.
+
+ProfessorIndex and CourseCodeMatcher only score the names and codes their
+indexes and bounds cannot rule out; these tests score everything with
+SequenceMatcher directly and expect the same answers, on the shipped data
+and on a seeded synthetic directory.
+
+    python -m pytest test_search_equivalence.py
+"""
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from benchmark import generate_directory, typo
+from char_matrix import CharMatrix, np
+from course_catalog import CourseCatalog
+from course_matcher import FUZZY_THRESHOLD as CODE_THRESHOLD
+from data_store import load_data
+from professor_index import FUZZY_THRESHOLD, ProfessorIndex
+from records import Professor
+from text_utils import normalize_name, tokenize
+
+LIMITS = [None, 1, 4]
+MAX_QUERIES = 200
+
+
+def ratio(a, b):
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+
+def datasets():
+    subjects, office_hours = load_data()
+    yield 'shipped', subjects, office_hours
+    subjects, office_hours = generate_directory(250, seed=7)
+    yield 'synthetic', subjects, office_hours
+
+
+DATASETS = {name: (subjects, office_hours) for name, subjects, office_hours in datasets()}
+
+
+def name_queries(names, seed=0):
+    """Prefixes and whole tokens of the names, partial names and names with one typo."""
+    rnd = random.Random(seed)
+    queries = set()
+    for name in names:
+        tokens = tokenize(name)
+        for token in tokens:
+            queries.update(token[:i] for i in range(2, len(token) + 1))
+        if len(tokens) > 1:
+            queries.add(f"{tokens[0]} {tokens[-1]}")
+        queries.add(typo(name, rnd))
+    queries = sorted(query for query in queries if normalize_name(query))
+    return rnd.sample(queries, min(MAX_QUERIES, len(queries)))
+
+
+def code_queries(codes, seed=0):
+    rnd = random.Random(seed)
+    queries = {typo(code, rnd) for code in codes} | {code[:-1] for code in codes} | set(codes)
+    queries = sorted(queries)
+    return rnd.sample(queries, min(MAX_QUERIES, len(queries)))
+
+
+def literal_scan(names, clean_input, limit):
+    """What _literal_matches() must return: every name, scored and ranked."""
+    ranked = []
+    for idx, name in enumerate(names):
+        if not name:
+            continue
+        similarity = ratio(clean_input, name)
+        contains = clean_input in name
+        if contains or similarity > FUZZY_THRESHOLD:
+            ranked.append((-similarity, idx, 'contains' if contains else 'fuzzy'))
+    ranked.sort()
+    return ranked[:limit] if limit else ranked
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'pure'])
+def use_numpy(request, monkeypatch):
+    if request.param and np is None:
+        pytest.skip('NumPy is not installed')
+    monkeypatch.setattr(CharMatrix, 'available', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('limit', LIMITS)
+def test_professor_literal_matches_equal_full_scan(dataset, limit, use_numpy):
+    _, office_hours = DATASETS[dataset]
+    index = ProfessorIndex([Professor.from_json(prof) for prof in office_hours])
+    assert (index._matrix is not None) == use_numpy
+    for query in name_queries([record.name for record in index.records]):
+        clean_input = normalize_name(query)
+        expected = literal_scan(index.names, clean_input, limit)
+        got = index._literal_matches(clean_input, limit)
+        assert [(idx, match_type) for _, idx, match_type in got] == \
+            [(idx, match_type) for _, idx, match_type in expected], query
+        assert [-score for score, _, _ in got] == pytest.approx([-score for score, _, _ in expected]), query
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+@pytest.mark.parametrize('limit', LIMITS)
+def test_professor_search_keeps_literal_hits(dataset, limit, use_numpy):
+    """Spelling-key hits are merged in, never in place of names containing the query."""
+    _, office_hours = DATASETS[dataset]
+    index = ProfessorIndex([Professor.from_json(prof) for prof in office_hours])
+    positions = {id(record): idx for idx, record in enumerate(index.records)}
+    for query in name_queries([record.name for record in index.records]):
+        clean_input = normalize_name(query)
+        results = index.search(query, limit)
+        if clean_input in index._exact:
+            assert [match.match_type for match in results] == ['exact'], query
+            continue
+        expected = literal_scan(index.names, clean_input, limit)
+        contains = [idx for _, idx, match_type in expected if match_type == 'contains']
+        # Names containing the query come first, in the full scan's order
+        assert [positions[id(match.record)] for match in results[:len(contains)]] == contains, query
+        if limit is None:
+            found = {positions[id(match.record)] for match in results}
+            assert found >= {idx for _, idx, _ in expected}, query
+
+
+@pytest.mark.parametrize('dataset', DATASETS)
+def test_course_code_matcher_equals_full_scan(dataset):
+    subjects, _ = DATASETS[dataset]
+    catalog = CourseCatalog(subjects)
+    first = {}
+    for position, entry in enumerate(catalog.entries):
+        first.setdefault(entry.code.lower(), (position, entry))
+
+    for query in code_queries([entry.code for entry in catalog.entries]):
+        scored = sorted((-ratio(query, entry.code), position, entry.code) for position, entry in first.values())
+        expected = [(code, -score) for score, _, code in scored if -score > CODE_THRESHOLD]
+
+        top = [(entry.code, similarity) for entry, similarity in catalog.code_matcher.top_k(query, k=5)]
+        assert [code for code, _ in top] == [code for code, _ in expected[:5]], query
+        assert [similarity for _, similarity in top] == pytest.approx([similarity for _, similarity in expected[:5]])
+
+        best = catalog.code_matcher.best(query)
+        if expected:
+            assert best[0].code == expected[0][0], query
+            assert best[1] == pytest.approx(expected[0][1])
+        else:
+            assert best is None, query
@@ -0,0 +1,88 @@
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+
+_DASH_RE = re.compile(r'[\u2010-\u2015\u2212\uFE58\uFE63\uFF0D\u2013\u2014\u2015]')
+_SPACE_RE = re.compile(r'\s+')
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def calculate_similarity(a, b, floor=None):
+    """Calculates the similarity between two strings.
+
+    With a floor, returns None instead when the similarity is certainly
+    below it (see SimilarityScorer).
+    """
+    return SimilarityScorer(a).score(b, floor)
+
+
+class SimilarityScorer:
+    """Scores many strings against one query, as calculate_similarity(query, text) would.
+
+    Scores are SequenceMatcher.ratio() from one reused matcher (the query
+    stays its first sequence, as ratio() is not symmetric). Given a floor,
+    score() first tries the cheap upper bounds on ratio() that
+    real_quick_ratio() and quick_ratio() compute, and skips the full
+    comparison when they already fall below it.
+    """
+
+    def __init__(self, query):
+        self.query = query.lower()
+        self._counts = None
+        self._matcher = SequenceMatcher(None, self.query, '')
+
+    def score(self, text, floor=None):
+        """Returns the similarity of text to the query, or None if it is below floor."""
+        text = text.lower()
+        if floor is not None:
+            total = len(self.query) + len(text)
+            if total:
+                # real_quick_ratio(): the shorter string matching in full
+                if 2.0 * min(len(self.query), len(text)) / total < floor:
+                    return None
+                # quick_ratio(): every shared character matching, in any order
+                if 2.0 * self._common_chars(text) / total < floor:
+                    return None
+        self._matcher.set_seq2(text)
+        return self._matcher.ratio()
+
+    def _common_chars(self, text):
+        if self._counts is None:
+            self._counts = Counter(self.query)
+        available = self._counts.copy()
+        common = 0
+        for char in text:
+            if available[char] > 0:
+                available[char] -= 1
+                common += 1
+        return common
+
+
+def normalize_name(name):
+    """Normalizes names for consistent matching."""
+    if not isinstance(name, str):
+        return ''
+    # Lowercase, strip, replace all dashes with '-', collapse spaces, remove diacritics
+    name = name.lower().strip()
+    name = _DASH_RE.sub('-', name)  # all dash-like chars
+    name = _SPACE_RE.sub(' ', name)
+    name = ''.join(c for c in unicodedata.normalize('NFKD', name) if not unicodedata.combining(c))
+    return name
+
+
+def normalize_message(message):
+    """Lowercases a chat message and collapses its whitespace."""
+    return ' '.join(message.lower().split())
+
+
+def tokenize(text):
+    """Splits normalized text into word tokens, dropping punctuation."""
+    return _TOKEN_RE.findall(text)
+
+
+def char_ngrams(text, n=3):
+    """Returns the set of character n-grams of a string."""
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}